@@ -1,42 +1,328 @@
 """
 Anomaly Detection using EWMA and Z-Score for pressure, radiation, and battery
 """
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict
+from array import array
+from dataclasses import dataclass, field, replace
+from typing import Callable, List, Optional, Dict, Tuple
 from datetime import datetime
 from app.models import Alert, AlertSeverity
+import itertools
 import uuid
 import math
+import numpy as np
 
 # Anomaly detection thresholds
 Z_SCORE_THRESHOLD = 2.5  # Standard deviations for anomaly detection
 Z_SCORE_CRITICAL = 3.5  # Critical anomaly threshold
 EWMA_ALPHA = 0.3  # Smoothing factor for EWMA (0 < alpha <= 1)
+MAX_HISTORY_SIZE = 100  # Sliding-window size per metric
 
-@dataclass
+# Severity tiering as lookup tables indexed by how many thresholds abs(z)
+# crossed (0 = nominal, 1 = warning, 2 = critical); replaces a branchy
+# if/elif cascade that mispredicts under noisy telemetry
+_SEV_THRESH = (0.0, Z_SCORE_THRESHOLD, Z_SCORE_CRITICAL)
+_SEV_BASE = (0.0, 0.5, 0.7)
+_SEV_SLOPE = (0.0, 0.15, 0.1)
+_SEV_CAP = (0.0, 0.95, 0.99)
+_SEV_LEVEL = (None, AlertSeverity.WARNING, AlertSeverity.CRITICAL)
+
+# Alert IDs: one urandom read per process, then a monotonic counter.
+# str(uuid.uuid4()) per alert costs more than the detection math itself.
+_PROC_UUID = uuid.uuid4().hex
+_next_id = itertools.count().__next__
+
+def _new_alert_id() -> str:
+    """Cheap process-unique alert ID"""
+    return f"{_PROC_UUID}-{_next_id()}"
+
+def _anomaly_tick(
+    mean: float, m2: float, ewma: float, ewvar: float,
+    min_value: float, max_value: float,
+    value: float, evicted: float, has_evicted: bool, n: int, is_first: bool
+):
+    """Fused per-sample kernel: window eviction, forward Welford, EWMA/EW-variance,
+    min/max and the cached reciprocals in one call (O(1), no intermediate tuples)"""
+    if has_evicted:
+        delta = evicted - mean
+        mean -= delta / (n - 1)
+        m2 -= delta * (evicted - mean)
+    if is_first:
+        ewma = value
+        ewvar = 0.0
+    else:
+        delta_e = value - ewma
+        ewvar = (1.0 - EWMA_ALPHA) * (ewvar + EWMA_ALPHA * delta_e * delta_e)
+        ewma = EWMA_ALPHA * value + (1.0 - EWMA_ALPHA) * ewma
+    delta = value - mean
+    mean += delta / n
+    delta2 = value - mean
+    m2 += delta * delta2
+    std_dev = math.sqrt(m2 / (n - 1)) if n > 1 else 0.0
+    if value < min_value:
+        min_value = value
+    if value > max_value:
+        max_value = value
+    inv_std_dev = 1.0 / std_dev if std_dev > 0.0 else 0.0
+    inv_mean = 1.0 / mean if mean != 0.0 else 0.0
+    return mean, m2, ewma, ewvar, std_dev, inv_std_dev, inv_mean, min_value, max_value
+
+# JIT-compile the per-sample kernel when numba is available; the pure-Python
+# definition above is the fallback
+try:
+    from numba import njit
+    _anomaly_tick = njit(cache=True)(_anomaly_tick)
+except ImportError:
+    pass
+
+@dataclass(slots=True)
 class MetricStatistics:
     """Statistics for a metric"""
     mean: float = 0.0
+    m2: float = 0.0  # Sum of squared differences from the mean (Welford)
     std_dev: float = 0.0
+    inv_std_dev: float = 0.0  # 1/std_dev (0.0 when std_dev is 0)
+    inv_mean: float = 0.0  # 1/mean (0.0 when mean is 0)
     ewma: float = 0.0
+    ewvar: float = 0.0  # Exponentially-weighted variance (drift detection)
     min_value: float = float('inf')
     max_value: float = float('-inf')
     sample_count: int = 0
     last_value: float = 0.0
+    # Fixed-size ring buffer of window samples: contiguous C doubles instead
+    # of boxed Python floats, with an insertion cursor
+    window: array = field(default_factory=lambda: array('d', bytes(8 * MAX_HISTORY_SIZE)))
+    cursor: int = 0
+    filled: int = 0
 
-@dataclass
-class AnomalyAlert:
-    """Anomaly detection alert with confidence and evidence"""
-    id: str
-    timestamp: datetime
-    metric: str  # "pressure", "radiation", "battery"
-    severity: AlertSeverity
+    def window_push(self, value: float) -> Optional[float]:
+        """Insert a sample into the ring; returns the evicted sample when full"""
+        evicted = None
+        if self.filled == MAX_HISTORY_SIZE:
+            evicted = self.window[self.cursor]
+        else:
+            self.filled += 1
+        self.window[self.cursor] = value
+        self.cursor = (self.cursor + 1) % MAX_HISTORY_SIZE
+        return evicted
+
+    def window_values(self) -> array:
+        """Window contents in chronological order"""
+        if self.filled < MAX_HISTORY_SIZE:
+            return self.window[:self.filled]
+        return self.window[self.cursor:] + self.window[:self.cursor]
+
+    def window_replace(self, values: List[float]):
+        """Replace the window contents (values already chronological, len <= size)"""
+        self.filled = len(values)
+        self.window[:self.filled] = array('d', values)
+        self.cursor = self.filled % MAX_HISTORY_SIZE
+
+def _pressure_messages(value: float, stats: 'MetricStatistics', z_score: float) -> Tuple[str, str]:
+    """Message and recommendation text for pressure anomalies"""
+    is_high = z_score > 0
+    message = (
+        f"Pressure anomaly detected: {value:.2f} kPa "
+        f"(z-score: {z_score:.2f}, {'above' if is_high else 'below'} mean by {abs(value - stats.mean):.2f} kPa)"
+    )
+    recommendation = (
+        f"Pressure is {'abnormally high' if is_high else 'abnormally low'} "
+        f"({abs(value - stats.mean):.2f} kPa deviation from mean {stats.mean:.2f} kPa). "
+        f"Investigate pressure systems and verify sensor readings."
+    )
+    return message, recommendation
+
+def _radiation_messages(value: float, stats: 'MetricStatistics', z_score: float) -> Tuple[str, str]:
+    """Message and recommendation text for radiation anomalies"""
+    message = (
+        f"Radiation anomaly detected: {value:.6f} mSv/hr "
+        f"(z-score: {z_score:.2f}, {value - stats.mean:.6f} mSv/hr above mean)"
+    )
+    recommendation = (
+        f"Radiation spike detected ({value:.6f} mSv/hr, {value - stats.mean:.6f} mSv/hr above mean). "
+        f"Verify sensor readings and check for solar events or shielding issues."
+    )
+    return message, recommendation
+
+def _battery_messages(value: float, stats: 'MetricStatistics', z_score: float) -> Tuple[str, str]:
+    """Message and recommendation text for battery anomalies"""
+    is_high = z_score > 0
+    message = (
+        f"Battery anomaly detected: {value:.2f} kWh "
+        f"(z-score: {z_score:.2f}, {'above' if is_high else 'below'} mean by {abs(value - stats.mean):.2f} kWh)"
+    )
+    if is_high:
+        recommendation = (
+            f"Battery level is abnormally high ({value:.2f} kWh, {value - stats.mean:.2f} kWh above mean). "
+            f"Possible overcharging or sensor malfunction. Verify charging systems."
+        )
+    else:
+        recommendation = (
+            f"Battery level is abnormally low ({value:.2f} kWh, {abs(value - stats.mean):.2f} kWh below mean). "
+            f"Possible rapid discharge or system issue. Investigate power consumption and battery health."
+        )
+    return message, recommendation
+
+@dataclass(frozen=True)
+class MetricConfig:
+    """Per-metric detection configuration"""
+    digits: int  # Rounding precision for evidence values
+    directional: bool = False  # Only positive-z spikes are anomalous
+    spike_type: bool = False  # Report anomaly_type as "spike" instead of high/low
+    has_ewma_deviation: bool = False
+    has_charge_rate: bool = False
+    messages: Callable[[float, 'MetricStatistics', float], Tuple[str, str]] = None
+
+METRIC_CONFIGS: Dict[str, MetricConfig] = {
+    "pressure": MetricConfig(digits=4, messages=_pressure_messages),
+    "radiation": MetricConfig(
+        digits=6, directional=True, spike_type=True,
+        has_ewma_deviation=True, messages=_radiation_messages
+    ),
+    "battery": MetricConfig(
+        digits=2, has_ewma_deviation=True,
+        has_charge_rate=True, messages=_battery_messages
+    ),
+}
+
+@dataclass(slots=True)
+class Evidence:
+    """Supporting evidence for an anomaly alert (slotted, no per-instance dict)"""
     current_value: float
+    mean: float
+    std_dev: float
+    ewma: float
     z_score: float
-    confidence: float  # 0.0-1.0
-    evidence: Dict  # Supporting evidence
-    message: str
-    recommendation: str
+    z_score_threshold: float
+    z_score_critical: float
+    deviation_from_mean: float
+    deviation_percent: float
+    sample_count: int
+    min_value: float
+    max_value: float
+    anomaly_type: str
+    statistical_significance: str
+    digits: int  # Display precision, applied only at the JSON boundary
+    ewma_deviation: Optional[float] = None
+    charge_rate: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        """Dict form for the JSON boundary (optional fields omitted when unset)
+
+        Rounding for display happens here, once per serialization, rather
+        than per constructed alert.
+        """
+        digits = self.digits
+        d = {
+            "current_value": self.current_value,
+            "mean": round(self.mean, digits),
+            "std_dev": round(self.std_dev, digits),
+            "ewma": round(self.ewma, digits),
+            "z_score": round(self.z_score, 4),
+            "z_score_threshold": self.z_score_threshold,
+            "z_score_critical": self.z_score_critical,
+            "deviation_from_mean": round(self.deviation_from_mean, digits),
+            "deviation_percent": round(self.deviation_percent, 2),
+            "sample_count": self.sample_count,
+            "min_value": round(self.min_value, digits),
+            "max_value": round(self.max_value, digits),
+            "anomaly_type": self.anomaly_type,
+            "statistical_significance": self.statistical_significance
+        }
+        if self.ewma_deviation is not None:
+            d["ewma_deviation"] = round(self.ewma_deviation, digits)
+        if self.charge_rate is not None:
+            d["charge_rate"] = round(self.charge_rate, 2)
+        return d
+
+class AnomalyAlert:
+    """
+    Anomaly detection alert with confidence and evidence
+
+    Evidence and the formatted message/recommendation strings are derived
+    lazily from a numeric statistics snapshot on first access, so alerts
+    that are filtered out downstream never pay for the dict allocation and
+    f-string formatting.
+
+    Slotted so queued alerts carry no per-instance __dict__; the lazy
+    fields use None sentinels instead of cached_property for that reason.
+    """
+
+    __slots__ = (
+        'id', 'timestamp', 'metric', 'severity', 'current_value',
+        'z_score', 'confidence', '_stats', '_config',
+        '_evidence', '_texts_cache'
+    )
+
+    def __init__(
+        self,
+        id: str,
+        timestamp: datetime,
+        metric: str,  # "pressure", "radiation", "battery"
+        severity: AlertSeverity,
+        current_value: float,
+        z_score: float,
+        confidence: float,  # 0.0-1.0
+        stats: MetricStatistics,  # Snapshot at detection time
+        config: 'MetricConfig'
+    ):
+        self.id = id
+        self.timestamp = timestamp
+        self.metric = metric
+        self.severity = severity
+        self.current_value = current_value
+        self.z_score = z_score
+        self.confidence = confidence
+        self._stats = stats
+        self._config = config
+        self._evidence = None
+        self._texts_cache = None
+
+    @property
+    def evidence(self) -> Evidence:
+        """Supporting evidence (built on first access)"""
+        if self._evidence is not None:
+            return self._evidence
+        stats = self._stats
+        config = self._config
+        value = self.current_value
+        digits = config.digits
+        abs_z_score = abs(self.z_score)
+
+        self._evidence = Evidence(
+            value,
+            stats.mean,
+            stats.std_dev,
+            stats.ewma,
+            self.z_score,
+            Z_SCORE_THRESHOLD,
+            Z_SCORE_CRITICAL,
+            value - stats.mean,
+            (value - stats.mean) * stats.inv_mean * 100,
+            stats.sample_count,
+            stats.min_value,
+            stats.max_value,
+            "spike" if config.spike_type else ("high" if self.z_score > 0 else "low"),
+            "critical" if abs_z_score >= Z_SCORE_CRITICAL else "significant",
+            digits,
+            ewma_deviation=value - stats.ewma if config.has_ewma_deviation else None,
+            # % change from EWMA
+            charge_rate=((value - stats.ewma) / stats.ewma * 100 if stats.ewma != 0 else 0) if config.has_charge_rate else None
+        )
+        return self._evidence
+
+    @property
+    def _texts(self) -> Tuple[str, str]:
+        if self._texts_cache is None:
+            self._texts_cache = self._config.messages(self.current_value, self._stats, self.z_score)
+        return self._texts_cache
+
+    @property
+    def message(self) -> str:
+        return self._texts[0]
+
+    @property
+    def recommendation(self) -> str:
+        return self._texts[1]
 
 class AnomalyDetector:
     """Anomaly detection using EWMA and Z-Score"""
@@ -45,43 +331,25 @@ class AnomalyDetector:
         self.pressure_stats = MetricStatistics()
         self.radiation_stats = MetricStatistics()
         self.battery_stats = MetricStatistics()
-        self.history: Dict[str, List[float]] = {
-            "pressure": [],
-            "radiation": [],
-            "battery": []
-        }
-        self.max_history_size = 100  # Keep last 100 samples
+        self.max_history_size = MAX_HISTORY_SIZE  # Keep last 100 samples
     
     def update_metric(self, metric_name: str, value: float):
         """Update metric statistics with new value"""
         stats = self._get_stats(metric_name)
-        
-        # Update history
-        if metric_name in self.history:
-            self.history[metric_name].append(value)
-            if len(self.history[metric_name]) > self.max_history_size:
-                self.history[metric_name].pop(0)
-        
-        # Update min/max
-        stats.min_value = min(stats.min_value, value)
-        stats.max_value = max(stats.max_value, value)
+
+        # Slide the window, then run the whole per-tick update (eviction
+        # reversal, forward Welford, EWMA, min/max, reciprocals) in one
+        # fused, optionally JIT-compiled kernel
+        evicted = stats.window_push(value)
         stats.last_value = value
         stats.sample_count += 1
-        
-        # Update EWMA
-        if stats.sample_count == 1:
-            stats.ewma = value
-        else:
-            stats.ewma = EWMA_ALPHA * value + (1 - EWMA_ALPHA) * stats.ewma
-        
-        # Update mean and std dev from history
-        if len(self.history[metric_name]) >= 2:
-            values = self.history[metric_name]
-            stats.mean = sum(values) / len(values)
-            
-            # Calculate standard deviation
-            variance = sum((x - stats.mean) ** 2 for x in values) / len(values)
-            stats.std_dev = math.sqrt(variance) if variance > 0 else 0.0
+        (stats.mean, stats.m2, stats.ewma, stats.ewvar, stats.std_dev,
+         stats.inv_std_dev, stats.inv_mean, stats.min_value, stats.max_value) = _anomaly_tick(
+            stats.mean, stats.m2, stats.ewma, stats.ewvar,
+            stats.min_value, stats.max_value,
+            value, evicted if evicted is not None else 0.0, evicted is not None,
+            stats.filled, stats.sample_count == 1
+        )
     
     def detect_anomalies(self, pressure: float, radiation: float, battery: float) -> List[AnomalyAlert]:
         """
@@ -91,240 +359,192 @@ class AnomalyDetector:
             List of anomaly alerts with confidence scores and evidence
         """
         alerts = []
-        
-        # Update metrics
-        self.update_metric("pressure", pressure)
-        self.update_metric("radiation", radiation)
-        self.update_metric("battery", battery)
-        
-        # Detect anomalies
-        pressure_alert = self._detect_pressure_anomaly(pressure)
-        if pressure_alert:
-            alerts.append(pressure_alert)
-        
-        radiation_alert = self._detect_radiation_anomaly(radiation)
-        if radiation_alert:
-            alerts.append(radiation_alert)
-        
-        battery_alert = self._detect_battery_anomaly(battery)
-        if battery_alert:
-            alerts.append(battery_alert)
-        
+        timestamp = datetime.utcnow()  # One clock read for all three metrics
+
+        for metric_name, value in (("pressure", pressure), ("radiation", radiation), ("battery", battery)):
+            self.update_metric(metric_name, value)
+            alert = self._detect(metric_name, value, timestamp)
+            if alert:
+                alerts.append(alert)
+
         return alerts
     
-    def _detect_pressure_anomaly(self, value: float) -> Optional[AnomalyAlert]:
-        """Detect pressure anomalies"""
-        stats = self.pressure_stats
-        
+    def detect_anomalies_batch(
+        self,
+        pressures: np.ndarray,
+        radiations: np.ndarray,
+        batteries: np.ndarray
+    ) -> List[AnomalyAlert]:
+        """
+        Detect anomalies over whole telemetry batches (backfills/replays)
+
+        Windowed mean/std are computed for every position in one vectorized
+        pass instead of looping detect_anomalies() one tick at a time.
+        Python-level work is only done for samples that actually cross the
+        z-score thresholds.
+
+        Returns:
+            List of anomaly alerts with confidence scores and evidence
+        """
+        alerts = []
+        alerts.extend(self._detect_batch("pressure", np.asarray(pressures, dtype=np.float64)))
+        alerts.extend(self._detect_batch("radiation", np.asarray(radiations, dtype=np.float64)))
+        alerts.extend(self._detect_batch("battery", np.asarray(batteries, dtype=np.float64)))
+        return alerts
+
+    def _detect_batch(self, metric_name: str, values: np.ndarray) -> List[AnomalyAlert]:
+        """Vectorized sliding-window detection for one metric's batch"""
+        if values.size == 0:
+            return []
+
+        stats = self._get_stats(metric_name)
+        w = self.max_history_size
+        prior_count = stats.sample_count
+
+        # EWMA / EW-variance recurrences over the batch (one light Python
+        # loop; the windowed stats below stay fully vectorized)
+        ewma_arr = np.empty(values.size)
+        ewvar_arr = np.empty(values.size)
+        e = stats.ewma
+        v2 = stats.ewvar
+        seeded = prior_count > 0
+        for i, sample in enumerate(values.tolist()):
+            if not seeded:
+                e = sample
+                v2 = 0.0
+                seeded = True
+            else:
+                delta_e = sample - e
+                v2 = (1.0 - EWMA_ALPHA) * (v2 + EWMA_ALPHA * delta_e * delta_e)
+                e = EWMA_ALPHA * sample + (1.0 - EWMA_ALPHA) * e
+            ewma_arr[i] = e
+            ewvar_arr[i] = v2
+
+        # Seed the window with existing history so batch results match streaming
+        x = np.concatenate((np.frombuffer(stats.window_values(), dtype=np.float64), values))
+        n_total = x.size
+
+        # Sliding-window sums via cumulative sums (two C loops for the whole batch)
+        csum = np.cumsum(x)
+        csq = np.cumsum(x * x)
+        wsum = csum.copy()
+        wsq = csq.copy()
+        wcount = np.minimum(np.arange(1, n_total + 1, dtype=np.float64), float(w))
+        if n_total > w:
+            wsum[w:] -= csum[:-w]
+            wsq[w:] -= csq[:-w]
+        mean = wsum / wcount
+        variance = np.maximum(wsq - wcount * mean * mean, 0.0) / np.maximum(wcount - 1.0, 1.0)
+        std = np.sqrt(variance)
+
+        # Restrict to the new samples and vectorize the z-score screen
+        offset = n_total - values.size
+        batch_mean = mean[offset:]
+        batch_std = std[offset:]
+        sample_counts = prior_count + np.arange(1, values.size + 1)
+        z = (values - batch_mean) / np.where(batch_std > 0, batch_std, 1.0)
+        candidate = (np.abs(z) >= Z_SCORE_THRESHOLD) & (batch_std > 0) & (sample_counts >= 10)
+        flagged = np.nonzero(candidate)[0]
+
+        # Running extremes including the pre-batch values
+        run_min = np.minimum(np.minimum.accumulate(values), stats.min_value)
+        run_max = np.maximum(np.maximum.accumulate(values), stats.max_value)
+
+        # Only flagged samples pay the Python-level alert construction cost;
+        # stats are positioned at each flagged index so evidence is consistent
+        alerts = []
+        timestamp = datetime.utcnow()
+        for idx in flagged:
+            i = int(idx)
+            stats.mean = float(batch_mean[i])
+            stats.std_dev = float(batch_std[i])
+            stats.inv_std_dev = 1.0 / stats.std_dev if stats.std_dev > 0 else 0.0
+            stats.inv_mean = 1.0 / stats.mean if stats.mean != 0 else 0.0
+            stats.ewma = float(ewma_arr[i])
+            stats.ewvar = float(ewvar_arr[i])
+            stats.sample_count = int(sample_counts[i])
+            stats.min_value = float(run_min[i])
+            stats.max_value = float(run_max[i])
+            stats.last_value = float(values[i])
+            alert = self._detect(metric_name, float(values[i]), timestamp)
+            if alert:
+                alerts.append(alert)
+
+        # Commit final statistics and window state for the whole batch
+        last = values.size - 1
+        stats.mean = float(batch_mean[last])
+        stats.std_dev = float(batch_std[last])
+        stats.inv_std_dev = 1.0 / stats.std_dev if stats.std_dev > 0 else 0.0
+        stats.inv_mean = 1.0 / stats.mean if stats.mean != 0 else 0.0
+        stats.m2 = float(variance[-1] * max(wcount[-1] - 1.0, 0.0))
+        stats.ewma = float(ewma_arr[last])
+        stats.ewvar = float(ewvar_arr[last])
+        stats.sample_count = int(sample_counts[last])
+        stats.min_value = float(run_min[last])
+        stats.max_value = float(run_max[last])
+        stats.last_value = float(values[last])
+        stats.window_replace(x[-w:].tolist())
+
+        return alerts
+
+    def _detect(
+        self,
+        metric_name: str,
+        value: float,
+        timestamp: Optional[datetime] = None,
+        # Default-arg bindings: LOAD_FAST instead of LOAD_GLOBAL on every tick
+        _abs=abs,
+        _min=min,
+        _configs=METRIC_CONFIGS,
+        _thresh=Z_SCORE_THRESHOLD,
+        _critical=Z_SCORE_CRITICAL,
+        _sev_thresh=_SEV_THRESH,
+        _sev_base=_SEV_BASE,
+        _sev_slope=_SEV_SLOPE,
+        _sev_cap=_SEV_CAP,
+        _sev_level=_SEV_LEVEL
+    ) -> Optional[AnomalyAlert]:
+        """Detect an anomaly for one metric using its MetricConfig"""
+        stats = self._get_stats(metric_name)
+
         if stats.sample_count < 10:  # Need minimum samples for reliable detection
             return None
-        
-        if stats.std_dev == 0:
-            return None
-        
-        # Calculate z-score
-        z_score = (value - stats.mean) / stats.std_dev if stats.std_dev > 0 else 0.0
-        
-        # Check for anomaly
-        abs_z_score = abs(z_score)
-        
-        if abs_z_score >= Z_SCORE_CRITICAL:
-            # Critical anomaly
-            confidence = min(0.99, 0.7 + (abs_z_score - Z_SCORE_CRITICAL) * 0.1)
-            severity = AlertSeverity.CRITICAL
-        elif abs_z_score >= Z_SCORE_THRESHOLD:
-            # Warning anomaly
-            confidence = min(0.95, 0.5 + (abs_z_score - Z_SCORE_THRESHOLD) * 0.15)
-            severity = AlertSeverity.WARNING
-        else:
-            return None
-        
-        # Determine if high or low anomaly
-        is_high = z_score > 0
-        
-        # Build evidence
-        evidence = {
-            "current_value": value,
-            "mean": round(stats.mean, 4),
-            "std_dev": round(stats.std_dev, 4),
-            "ewma": round(stats.ewma, 4),
-            "z_score": round(z_score, 4),
-            "z_score_threshold": Z_SCORE_THRESHOLD,
-            "z_score_critical": Z_SCORE_CRITICAL,
-            "deviation_from_mean": round(value - stats.mean, 4),
-            "deviation_percent": round(((value - stats.mean) / stats.mean * 100) if stats.mean != 0 else 0, 2),
-            "sample_count": stats.sample_count,
-            "min_value": round(stats.min_value, 4),
-            "max_value": round(stats.max_value, 4),
-            "anomaly_type": "high" if is_high else "low",
-            "statistical_significance": "critical" if abs_z_score >= Z_SCORE_CRITICAL else "significant"
-        }
-        
-        message = (
-            f"Pressure anomaly detected: {value:.2f} kPa "
-            f"(z-score: {z_score:.2f}, {'above' if is_high else 'below'} mean by {abs(value - stats.mean):.2f} kPa)"
-        )
-        
-        recommendation = (
-            f"Pressure is {'abnormally high' if is_high else 'abnormally low'} "
-            f"({abs(value - stats.mean):.2f} kPa deviation from mean {stats.mean:.2f} kPa). "
-            f"Investigate pressure systems and verify sensor readings."
-        )
-        
-        return AnomalyAlert(
-            id=str(uuid.uuid4()),
-            timestamp=datetime.utcnow(),
-            metric="pressure",
-            severity=severity,
-            current_value=value,
-            z_score=z_score,
-            confidence=confidence,
-            evidence=evidence,
-            message=message,
-            recommendation=recommendation
-        )
-    
-    def _detect_radiation_anomaly(self, value: float) -> Optional[AnomalyAlert]:
-        """Detect radiation anomalies"""
-        stats = self.radiation_stats
-        
-        if stats.sample_count < 10:
-            return None
-        
-        if stats.std_dev == 0:
-            return None
-        
-        # Calculate z-score
-        z_score = (value - stats.mean) / stats.std_dev if stats.std_dev > 0 else 0.0
-        abs_z_score = abs(z_score)
-        
-        # Radiation anomalies are typically high (spikes)
-        if abs_z_score >= Z_SCORE_CRITICAL and z_score > 0:
-            confidence = min(0.99, 0.7 + (abs_z_score - Z_SCORE_CRITICAL) * 0.1)
-            severity = AlertSeverity.CRITICAL
-        elif abs_z_score >= Z_SCORE_THRESHOLD and z_score > 0:
-            confidence = min(0.95, 0.5 + (abs_z_score - Z_SCORE_THRESHOLD) * 0.15)
-            severity = AlertSeverity.WARNING
-        else:
-            return None
-        
-        # Build evidence
-        evidence = {
-            "current_value": value,
-            "mean": round(stats.mean, 6),
-            "std_dev": round(stats.std_dev, 6),
-            "ewma": round(stats.ewma, 6),
-            "z_score": round(z_score, 4),
-            "z_score_threshold": Z_SCORE_THRESHOLD,
-            "z_score_critical": Z_SCORE_CRITICAL,
-            "deviation_from_mean": round(value - stats.mean, 6),
-            "deviation_percent": round(((value - stats.mean) / stats.mean * 100) if stats.mean != 0 else 0, 2),
-            "sample_count": stats.sample_count,
-            "min_value": round(stats.min_value, 6),
-            "max_value": round(stats.max_value, 6),
-            "anomaly_type": "spike",
-            "statistical_significance": "critical" if abs_z_score >= Z_SCORE_CRITICAL else "significant",
-            "ewma_deviation": round(value - stats.ewma, 6)
-        }
-        
-        message = (
-            f"Radiation anomaly detected: {value:.6f} mSv/hr "
-            f"(z-score: {z_score:.2f}, {value - stats.mean:.6f} mSv/hr above mean)"
-        )
-        
-        recommendation = (
-            f"Radiation spike detected ({value:.6f} mSv/hr, {value - stats.mean:.6f} mSv/hr above mean). "
-            f"Verify sensor readings and check for solar events or shielding issues."
-        )
-        
-        return AnomalyAlert(
-            id=str(uuid.uuid4()),
-            timestamp=datetime.utcnow(),
-            metric="radiation",
-            severity=severity,
-            current_value=value,
-            z_score=z_score,
-            confidence=confidence,
-            evidence=evidence,
-            message=message,
-            recommendation=recommendation
-        )
-    
-    def _detect_battery_anomaly(self, value: float) -> Optional[AnomalyAlert]:
-        """Detect battery anomalies"""
-        stats = self.battery_stats
-        
-        if stats.sample_count < 10:
-            return None
-        
-        if stats.std_dev == 0:
+
+        # Calculate z-score (multiply by the cached reciprocal). A degenerate
+        # window (std_dev == 0) has inv_std_dev == 0, so z collapses to 0 and
+        # falls out on the tier check below.
+        z_score = (value - stats.mean) * stats.inv_std_dev
+        abs_z_score = _abs(z_score)
+
+        # Branchless severity tiering: two compares index the lookup tables.
+        # Almost every tick exits here, before any further work
+        tier = (abs_z_score >= _thresh) + (abs_z_score >= _critical)
+        if tier == 0:
             return None
-        
-        # Calculate z-score
-        z_score = (value - stats.mean) / stats.std_dev if stats.std_dev > 0 else 0.0
-        abs_z_score = abs(z_score)
-        
-        # Battery anomalies can be high (overcharging) or low (rapid discharge)
-        if abs_z_score >= Z_SCORE_CRITICAL:
-            confidence = min(0.99, 0.7 + (abs_z_score - Z_SCORE_CRITICAL) * 0.1)
-            severity = AlertSeverity.CRITICAL
-        elif abs_z_score >= Z_SCORE_THRESHOLD:
-            confidence = min(0.95, 0.5 + (abs_z_score - Z_SCORE_THRESHOLD) * 0.15)
-            severity = AlertSeverity.WARNING
-        else:
+
+        config = _configs[metric_name]
+
+        # Directional metrics (radiation) only alarm on positive spikes
+        if config.directional and z_score <= 0:
             return None
-        
-        is_high = z_score > 0
-        
-        # Build evidence
-        evidence = {
-            "current_value": value,
-            "mean": round(stats.mean, 2),
-            "std_dev": round(stats.std_dev, 2),
-            "ewma": round(stats.ewma, 2),
-            "z_score": round(z_score, 4),
-            "z_score_threshold": Z_SCORE_THRESHOLD,
-            "z_score_critical": Z_SCORE_CRITICAL,
-            "deviation_from_mean": round(value - stats.mean, 2),
-            "deviation_percent": round(((value - stats.mean) / stats.mean * 100) if stats.mean != 0 else 0, 2),
-            "sample_count": stats.sample_count,
-            "min_value": round(stats.min_value, 2),
-            "max_value": round(stats.max_value, 2),
-            "anomaly_type": "high" if is_high else "low",
-            "statistical_significance": "critical" if abs_z_score >= Z_SCORE_CRITICAL else "significant",
-            "ewma_deviation": round(value - stats.ewma, 2),
-            "charge_rate": round((value - stats.ewma) / stats.ewma * 100 if stats.ewma != 0 else 0, 2)  # % change from EWMA
-        }
-        
-        message = (
-            f"Battery anomaly detected: {value:.2f} kWh "
-            f"(z-score: {z_score:.2f}, {'above' if is_high else 'below'} mean by {abs(value - stats.mean):.2f} kWh)"
-        )
-        
-        if is_high:
-            recommendation = (
-                f"Battery level is abnormally high ({value:.2f} kWh, {value - stats.mean:.2f} kWh above mean). "
-                f"Possible overcharging or sensor malfunction. Verify charging systems."
-            )
-        else:
-            recommendation = (
-                f"Battery level is abnormally low ({value:.2f} kWh, {abs(value - stats.mean):.2f} kWh below mean). "
-                f"Possible rapid discharge or system issue. Investigate power consumption and battery health."
-            )
-        
+
+        severity = _sev_level[tier]
+        confidence = _min(_sev_cap[tier], _sev_base[tier] + (abs_z_score - _sev_thresh[tier]) * _sev_slope[tier])
+
+        # Evidence and message text are built lazily by AnomalyAlert from a
+        # snapshot of the statistics at detection time
         return AnomalyAlert(
-            id=str(uuid.uuid4()),
-            timestamp=datetime.utcnow(),
-            metric="battery",
+            id=_new_alert_id(),
+            timestamp=timestamp if timestamp is not None else datetime.utcnow(),
+            metric=metric_name,
             severity=severity,
             current_value=value,
             z_score=z_score,
             confidence=confidence,
-            evidence=evidence,
-            message=message,
-            recommendation=recommendation
+            stats=replace(stats),
+            config=config
         )
-    
+
     def _get_stats(self, metric_name: str) -> MetricStatistics:
         """Get statistics for a metric"""
         if metric_name == "pressure":
@@ -343,6 +563,7 @@ class AnomalyDetector:
                 "mean": round(self.pressure_stats.mean, 4),
                 "std_dev": round(self.pressure_stats.std_dev, 4),
                 "ewma": round(self.pressure_stats.ewma, 4),
+                "ew_std_dev": round(math.sqrt(self.pressure_stats.ewvar), 4),
                 "sample_count": self.pressure_stats.sample_count,
                 "min": round(self.pressure_stats.min_value, 4),
                 "max": round(self.pressure_stats.max_value, 4)
@@ -351,6 +572,7 @@ class AnomalyDetector:
                 "mean": round(self.radiation_stats.mean, 6),
                 "std_dev": round(self.radiation_stats.std_dev, 6),
                 "ewma": round(self.radiation_stats.ewma, 6),
+                "ew_std_dev": round(math.sqrt(self.radiation_stats.ewvar), 6),
                 "sample_count": self.radiation_stats.sample_count,
                 "min": round(self.radiation_stats.min_value, 6),
                 "max": round(self.radiation_stats.max_value, 6)
@@ -359,6 +581,7 @@ class AnomalyDetector:
                 "mean": round(self.battery_stats.mean, 2),
                 "std_dev": round(self.battery_stats.std_dev, 2),
                 "ewma": round(self.battery_stats.ewma, 2),
+                "ew_std_dev": round(math.sqrt(self.battery_stats.ewvar), 2),
                 "sample_count": self.battery_stats.sample_count,
                 "min": round(self.battery_stats.min_value, 2),
                 "max": round(self.battery_stats.max_value, 2)
@@ -371,12 +594,9 @@ class AnomalyDetector:
             self.pressure_stats = MetricStatistics()
             self.radiation_stats = MetricStatistics()
             self.battery_stats = MetricStatistics()
-            self.history = {"pressure": [], "radiation": [], "battery": []}
         else:
             stats = self._get_stats(metric_name)
             stats.__init__()
-            if metric_name in self.history:
-                self.history[metric_name] = []
 
 # Singleton instance
 _anomaly_detector_instance = None
@@ -1,19 +1,90 @@
 """
 Append-only audit logging system
 """
-import json
+import atexit
+import mmap
+import orjson
 import os
+import queue
+import sys
+import threading
 from datetime import datetime
 from typing import Optional, Dict, Any
 from pathlib import Path
 
+# Maximum lines written per batch by the background flusher
+FLUSH_BATCH_SIZE = 256
+
 class AuditLogger:
-    """Append-only file-based audit logger"""
-    
+    """Append-only file-based audit logger with buffered background writes"""
+
     def __init__(self, log_file: str = "audit_log.jsonl"):
         self.log_file = Path(log_file)
         self.log_dir = self.log_file.parent
         self.log_dir.mkdir(parents=True, exist_ok=True)
+
+        # log() only enqueues; a daemon thread batches lines onto a
+        # persistent handle instead of open()+write()+close() per call
+        self._fh = open(self.log_file, "ab", buffering=1 << 16)
+        self._queue: "queue.Queue[bytes]" = queue.Queue()
+
+        # In-process entry counter; the cached mtime detects external writers
+        self._count = self._recount()
+        self._count_mtime = self._stat_mtime_ns()
+
+        self._writer = threading.Thread(target=self._drain_loop, daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def _stat_mtime_ns(self) -> int:
+        try:
+            return self.log_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def _recount(self) -> int:
+        """Full scan of the log file (only needed when the cache is stale)"""
+        if not self.log_file.exists():
+            return 0
+        count = 0
+        with open(self.log_file, "rb") as f:
+            for line in f:
+                if line.strip():
+                    count += 1
+        return count
+
+    def _drain_loop(self):
+        """Background consumer: batch queued lines onto the log file"""
+        while True:
+            lines = [self._queue.get()]
+            try:
+                while len(lines) < FLUSH_BATCH_SIZE:
+                    lines.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            # A failed write (disk full, closed handle) must not kill the
+            # consumer thread: flush() joins the queue, so dying before
+            # task_done would hang it forever while log() keeps queueing
+            # entries nobody drains. Surface the loss and keep consuming.
+            try:
+                self._fh.writelines(lines)
+                self._fh.flush()
+                # Our own writes must not look like external modifications
+                self._count_mtime = self._stat_mtime_ns()
+            except Exception as e:
+                print(f"Audit log write failed, {len(lines)} entries lost: {e}",
+                      file=sys.stderr)
+            finally:
+                for _ in lines:
+                    self._queue.task_done()
+
+    def flush(self):
+        """Block until all queued entries are written to disk"""
+        self._queue.join()
+        try:
+            self._fh.flush()
+        except ValueError:
+            pass  # Handle already closed at interpreter shutdown
     
     def log(
         self,
@@ -36,20 +107,45 @@ class AuditLogger:
         Returns:
             The logged entry
         """
+        # The timestamp stays a datetime in the returned entry so callers
+        # never parse it back; orjson formats it to the same ISO string the
+        # file always carried
         entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcnow(),
             "user": user,
             "action": action,
             "resource": resource,
             "status": status,
             "details": details or {}
         }
-        
-        # Append to file (append-only)
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry) + "\n")
-        
+
+        # Enqueue for the background flusher (append-only); orjson emits
+        # bytes directly with the trailing newline
+        self._queue.put(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE))
+        self._count += 1
+
         return entry
+
+    def _iter_lines_reverse(self):
+        """Yield log lines newest-first by walking an mmap backward from EOF"""
+        with open(self.log_file, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return  # Empty file cannot be mapped
+            try:
+                end = mm.size()
+                # Ignore the trailing newline so rfind lands on line boundaries
+                if end and mm[end - 1] == 0x0A:
+                    end -= 1
+                while end > 0:
+                    start = mm.rfind(b"\n", 0, end) + 1
+                    if end > start:
+                        # Only consumed lines are copied out of the map
+                        yield mm[start:end]
+                    end = start - 1
+            finally:
+                mm.close()
     
     def read_logs(
         self,
@@ -68,38 +164,54 @@ class AuditLogger:
         Returns:
             List of log entries
         """
+        self.flush()  # Read-your-writes: drain pending entries first
         if not self.log_file.exists():
             return []
-        
+
+        # The file is append-only and chronological, so reading backward
+        # yields newest-first without parsing or sorting the whole file
         entries = []
-        with open(self.log_file, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        entry = json.loads(line)
-                        if filter_func is None or filter_func(entry):
-                            entries.append(entry)
-                    except json.JSONDecodeError:
-                        continue
-        
-        # Sort by timestamp (newest first)
-        entries.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-        
-        # Pagination
-        return entries[offset:offset + limit]
+        to_skip = offset
+        for line in self._iter_lines_reverse():
+            try:
+                entry = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+            if filter_func is not None and not filter_func(entry):
+                continue
+            if to_skip > 0:
+                to_skip -= 1
+                continue
+            entries.append(entry)
+            if len(entries) >= limit:
+                break
+
+        return entries
     
-    def get_log_count(self) -> int:
-        """Get total number of log entries"""
+    def count_matching(self, filter_func: callable) -> int:
+        """Count entries matching filter_func (full scan of the file)"""
+        self.flush()
         if not self.log_file.exists():
             return 0
-        
         count = 0
-        with open(self.log_file, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    count += 1
+        for line in self._iter_lines_reverse():
+            try:
+                entry = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+            if filter_func(entry):
+                count += 1
         return count
 
+    def get_log_count(self) -> int:
+        """Get total number of log entries (O(1) unless an external writer touched the file)"""
+        self.flush()
+        mtime = self._stat_mtime_ns()
+        if mtime != self._count_mtime:
+            self._count = self._recount()
+            self._count_mtime = mtime
+        return self._count
+
 # Singleton instance
 _audit_logger_instance = None
 
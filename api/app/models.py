@@ -1,8 +1,9 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from enum import Enum
 from dataclasses import dataclass
+import numpy as np
 
 # System State Models
 class AtmosphereState(BaseModel):
@@ -51,7 +52,14 @@ class AlertSeverity(str, Enum):
     WARNING = "warning"
     CRITICAL = "critical"
 
-class Alert(BaseModel):
+# Alert, Recommendation, and AuditLogEntry are only ever constructed
+# internally (never parsed from client input), so they are plain slotted
+# dataclasses: construction skips validator dispatch entirely and the
+# instances carry no __dict__, which matters with thousands of them held
+# in the in-memory stores. Serialization at the API boundary goes through
+# dataclasses.asdict.
+@dataclass(slots=True)
+class Alert:
     id: str
     timestamp: datetime
     severity: AlertSeverity
@@ -61,7 +69,8 @@ class Alert(BaseModel):
     resolved: bool = False
 
 # Recommendation Models
-class Recommendation(BaseModel):
+@dataclass(slots=True)
+class Recommendation:
     id: str
     timestamp: datetime
     priority: str  # "low", "medium", "high"
@@ -71,13 +80,14 @@ class Recommendation(BaseModel):
     action_required: bool = False
 
 # Audit Log Models
-class AuditLogEntry(BaseModel):
+@dataclass(slots=True)
+class AuditLogEntry:
     id: str
     timestamp: datetime
-    user: Optional[str] = None
     action: str
     resource: str
     status: str  # "success", "failure", "pending"
+    user: Optional[str] = None
     details: Optional[str] = None
 
 # Settlement State Dataclass
@@ -107,9 +117,10 @@ def update_settlement_state_from_telemetry(state: SettlementState, telemetry: di
     Returns:
         Updated SettlementState instance
     """
-    # Extract atmosphere data
-    if "atmosphere" in telemetry:
-        atm = telemetry["atmosphere"]
+    # Each section is fetched once with .get — the membership test plus
+    # subscript would hash the same key twice
+    atm = telemetry.get("atmosphere")
+    if atm is not None:
         state.o2_pct = atm.get("oxygen_level", state.o2_pct)
         # Convert CO2 percentage to PPM (if needed)
         co2_level = atm.get("co2_level", state.co2_ppm / 10000.0)
@@ -121,8 +132,8 @@ def update_settlement_state_from_telemetry(state: SettlementState, telemetry: di
         state.humidity_pct = atm.get("humidity", state.humidity_pct)
     
     # Extract power data
-    if "power" in telemetry:
-        power = telemetry["power"]
+    power = telemetry.get("power")
+    if power is not None:
         state.solar_kw = power.get("solar_generation", state.solar_kw)
         # Convert battery percentage to kWh (assuming 500 kWh is 100%)
         battery_pct = power.get("battery_charge", (state.battery_kwh / 500.0) * 100.0)
@@ -130,23 +141,101 @@ def update_settlement_state_from_telemetry(state: SettlementState, telemetry: di
         state.load_kw = power.get("power_consumption", state.load_kw)
     
     # Extract agriculture data
-    if "agriculture" in telemetry:
-        ag = telemetry["agriculture"]
+    ag = telemetry.get("agriculture")
+    if ag is not None:
         state.crop_health_index = ag.get("crop_health", state.crop_health_index)
     
     # Extract radiation data
-    if "radiation" in telemetry:
-        rad = telemetry["radiation"]
+    rad = telemetry.get("radiation")
+    if rad is not None:
         # Convert mSv/day to mSv/hr
         rad_day = rad.get("radiation_level", state.radiation_msv_hr * 24.0)
         state.radiation_msv_hr = rad_day / 24.0
     
     # Extract structural data for strain index
-    if "structural" in telemetry:
-        struct = telemetry["structural"]
+    struct = telemetry.get("structural")
+    if struct is not None:
         # Calculate strain index from structural integrity (inverse relationship)
         # 100% integrity = 0 strain, 0% integrity = 1.0 strain
         integrity = struct.get("structural_integrity", 100.0 - (state.strain_index * 100.0))
         state.strain_index = max(0.0, min(1.0, (100.0 - integrity) / 100.0))
-    
+
     return state
+
+# Telemetry columns consumed by the batch path: SettlementState field ->
+# (telemetry section, key). Unit conversions are applied as whole-array
+# ufuncs after extraction.
+_BATCH_TELEMETRY_COLUMNS = {
+    "o2_pct": ("atmosphere", "oxygen_level"),
+    "co2_ppm": ("atmosphere", "co2_level"),
+    "pressure_kpa": ("atmosphere", "pressure"),
+    "temp_c": ("atmosphere", "temperature"),
+    "humidity_pct": ("atmosphere", "humidity"),
+    "solar_kw": ("power", "solar_generation"),
+    "battery_kwh": ("power", "battery_charge"),
+    "load_kw": ("power", "power_consumption"),
+    "crop_health_index": ("agriculture", "crop_health"),
+    "radiation_msv_hr": ("radiation", "radiation_level"),
+    "strain_index": ("structural", "structural_integrity"),
+}
+
+_EMPTY_SECTION: dict = {}
+_STATE_DEFAULTS = SettlementState()
+
+# Scratch instance for callers that build a state from telemetry, read it
+# synchronously, and never retain it. update_settlement_state_from_telemetry
+# mutates in place, the event loop is single-threaded, and no such caller
+# awaits between the build and the reads, so one process-wide instance is
+# safe and steady-state serving allocates no state objects at all. Callers
+# that hand the state out or key caches on its identity (the shared
+# telemetry snapshot) must keep allocating fresh instances.
+_scratch_state = SettlementState()
+
+def get_scratch_settlement_state() -> SettlementState:
+    """Return the process-wide scratch SettlementState for transient reads"""
+    return _scratch_state
+
+def update_settlement_states_batch(telemetries: List[dict]) -> Dict[str, np.ndarray]:
+    """
+    Build settlement state columns from a batch of telemetry messages.
+
+    Vectorized twin of update_settlement_state_from_telemetry: each field
+    is extracted in one pass into a float64 array and the unit conversions
+    (psi -> kPa, battery % -> kWh, mSv/day -> mSv/hr, integrity -> strain)
+    run as whole-array ufuncs instead of per-message Python arithmetic.
+    Missing readings take the SettlementState defaults. The returned
+    struct-of-arrays dict feeds DecisionEngine.generate_recommendations_batch
+    and generate_recommendations_fleet directly.
+
+    Args:
+        telemetries: Telemetry message dicts, one per habitat/tick
+
+    Returns:
+        Dict keyed by SettlementState field name, one equal-length
+        float64 array per field
+    """
+    n = len(telemetries)
+    columns = {
+        field: np.fromiter(
+            (t.get(section, _EMPTY_SECTION).get(key, np.nan) for t in telemetries),
+            dtype=np.float64, count=n,
+        )
+        for field, (section, key) in _BATCH_TELEMETRY_COLUMNS.items()
+    }
+
+    # Unit conversions, in place on the freshly built arrays
+    co2 = columns["co2_ppm"]
+    columns["co2_ppm"] = np.where(co2 < 1.0, co2 * 10000.0, co2)  # % -> ppm
+    np.multiply(columns["pressure_kpa"], 6.89476, out=columns["pressure_kpa"])  # psi -> kPa
+    np.multiply(columns["battery_kwh"], 5.0, out=columns["battery_kwh"])  # % of 500 kWh -> kWh
+    np.divide(columns["radiation_msv_hr"], 24.0, out=columns["radiation_msv_hr"])  # mSv/day -> mSv/hr
+    integrity = columns["strain_index"]
+    columns["strain_index"] = np.clip((100.0 - integrity) / 100.0, 0.0, 1.0)
+
+    # Fill absent readings with the dataclass defaults (NaN survives every
+    # conversion above, so it still marks the originally missing cells)
+    for field, arr in columns.items():
+        missing = np.isnan(arr)
+        if missing.any():
+            columns[field] = np.where(missing, getattr(_STATE_DEFAULTS, field), arr)
+    return columns
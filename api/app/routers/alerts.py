@@ -1,92 +1,127 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
 from app.models import Alert, AlertSeverity
+from dataclasses import asdict
+from app.id_gen import new_id
 from app.sensor_simulator import SensorSimulator, get_sensor_simulator
+from collections import deque
 from datetime import datetime
-from typing import List, Optional
-import uuid
+from itertools import islice
+from operator import attrgetter
+from typing import Deque, Dict, List, Optional
+import asyncio
+import heapq
+import numpy as np
 
 router = APIRouter()
 
-# In-memory alert storage (in production, use a database)
-alerts_db: List[Alert] = []
+# In-memory alert storage (in production, use a database). A bounded ring
+# buffer: appends are O(1) and the oldest alerts fall off the left once the
+# cap is reached, so memory stays constant regardless of uptime
+_MAX_ALERTS = 10_000
+alerts_db: Deque[Alert] = deque(maxlen=_MAX_ALERTS)
+
+# Parallel id -> Alert index so /alerts/{alert_id} lookups are O(1)
+# instead of scanning the whole list; every writer goes through
+# record_alerts to keep the two in sync
+alerts_by_id: Dict[str, Alert] = {}
+
+_BY_TIMESTAMP = attrgetter("timestamp")
+
+def record_alerts(new_alerts: List[Alert]):
+    """Append alerts to the store and the id index together"""
+    for alert in new_alerts:
+        # Drop the about-to-be-evicted alert from the index so it tracks
+        # the ring buffer instead of growing forever
+        if len(alerts_db) == _MAX_ALERTS:
+            alerts_by_id.pop(alerts_db[0].id, None)
+        alerts_db.append(alert)
+        alerts_by_id[alert.id] = alert
+
+# Deferred persistence: producers drop alerts on the queue in O(1) and
+# return; the background drain task started at application startup empties
+# the queue in batches and runs record_alerts once per batch
+_alert_queue: "asyncio.Queue[Alert]" = asyncio.Queue()
+
+def queue_alerts(new_alerts: List[Alert]):
+    """Enqueue alerts for the background writer (O(1), never blocks)"""
+    for alert in new_alerts:
+        _alert_queue.put_nowait(alert)
+
+async def drain_alert_queue():
+    """Background consumer: batch queued alerts into the store"""
+    while True:
+        batch = [await _alert_queue.get()]
+        # Take everything already waiting so a burst lands as one batch
+        while True:
+            try:
+                batch.append(_alert_queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        record_alerts(batch)
+
+# Threshold table for generate_alert, one row per monitored channel:
+# oxygen, co2, battery, radiation, structural integrity. Comparisons are
+# sign-normalized (above-threshold channels negated) so every check is a
+# single vectorized "signed value < threshold"; -inf means the channel has
+# no critical tier.
+_ALERT_SIGN = np.array([1.0, -1.0, 1.0, -1.0, 1.0])
+_ALERT_CRITICAL = np.array([20.0, -np.inf, 30.0, -np.inf, -np.inf])
+_ALERT_WARNING = np.array([20.5, -0.05, 50.0, -0.7, 95.0])
+_ALERT_SYSTEM = ("atmosphere", "atmosphere", "power", "radiation", "structural")
+# Message builders are .format bound at import time: calling one skips
+# the per-alert f-string bytecode and format-spec parsing
+_ALERT_CRIT_MSG = (
+    "Oxygen level critically low: {:.2f}%".format,
+    None,
+    "Battery charge critically low: {:.2f}%".format,
+    None,
+    None,
+)
+_ALERT_WARN_MSG = (
+    "Oxygen level below optimal: {:.2f}%".format,
+    "CO2 level elevated: {:.4f}%".format,
+    "Battery charge low: {:.2f}%".format,
+    "Radiation level elevated: {:.4f} mSv/day".format,
+    "Structural integrity below optimal: {:.2f}%".format,
+)
 
 def generate_alert(sensor_simulator: SensorSimulator) -> List[Alert]:
     """Generate alerts based on current sensor readings"""
     state = sensor_simulator.get_current_state()
+
+    atm = state["atmosphere"]
+    values = np.array([
+        atm["oxygen_level"],
+        atm["co2_level"],
+        state["power"]["battery_charge"],
+        state["radiation"]["radiation_level"],
+        state["structural"]["structural_integrity"],
+    ])
+
+    # Vectorized two-tier screen; Alert objects are only built for rows
+    # that actually fired
+    signed = _ALERT_SIGN * values
+    critical = signed < _ALERT_CRITICAL
+    warning = (signed < _ALERT_WARNING) & ~critical
+    fired = critical | warning
+    if not fired.any():
+        return []
+
+    # One timestamp for the whole pass: alerts from the same reading share
+    # it, and we skip a clock read (plus formatting) per alert
+    now = datetime.utcnow()
     new_alerts = []
-    
-    # Check atmosphere
-    if state["atmosphere"]["oxygen_level"] < 20.0:
-        new_alerts.append(Alert(
-            id=str(uuid.uuid4()),
-            timestamp=datetime.utcnow(),
-            severity=AlertSeverity.CRITICAL,
-            category="atmosphere",
-            message=f"Oxygen level critically low: {state['atmosphere']['oxygen_level']:.2f}%",
-            system="atmosphere"
-        ))
-    elif state["atmosphere"]["oxygen_level"] < 20.5:
-        new_alerts.append(Alert(
-            id=str(uuid.uuid4()),
-            timestamp=datetime.utcnow(),
-            severity=AlertSeverity.WARNING,
-            category="atmosphere",
-            message=f"Oxygen level below optimal: {state['atmosphere']['oxygen_level']:.2f}%",
-            system="atmosphere"
-        ))
-    
-    if state["atmosphere"]["co2_level"] > 0.05:
-        new_alerts.append(Alert(
-            id=str(uuid.uuid4()),
-            timestamp=datetime.utcnow(),
-            severity=AlertSeverity.WARNING,
-            category="atmosphere",
-            message=f"CO2 level elevated: {state['atmosphere']['co2_level']:.4f}%",
-            system="atmosphere"
-        ))
-    
-    # Check power
-    if state["power"]["battery_charge"] < 30.0:
+    for i in np.nonzero(fired)[0]:
+        is_critical = critical[i]
+        value = float(values[i])
         new_alerts.append(Alert(
-            id=str(uuid.uuid4()),
-            timestamp=datetime.utcnow(),
-            severity=AlertSeverity.CRITICAL,
-            category="power",
-            message=f"Battery charge critically low: {state['power']['battery_charge']:.2f}%",
-            system="power"
+            id=new_id(),
+            timestamp=now,
+            severity=AlertSeverity.CRITICAL if is_critical else AlertSeverity.WARNING,
+            category=_ALERT_SYSTEM[i],
+            message=(_ALERT_CRIT_MSG[i] if is_critical else _ALERT_WARN_MSG[i])(value),
+            system=_ALERT_SYSTEM[i]
         ))
-    elif state["power"]["battery_charge"] < 50.0:
-        new_alerts.append(Alert(
-            id=str(uuid.uuid4()),
-            timestamp=datetime.utcnow(),
-            severity=AlertSeverity.WARNING,
-            category="power",
-            message=f"Battery charge low: {state['power']['battery_charge']:.2f}%",
-            system="power"
-        ))
-    
-    # Check radiation
-    if state["radiation"]["radiation_level"] > 0.7:
-        new_alerts.append(Alert(
-            id=str(uuid.uuid4()),
-            timestamp=datetime.utcnow(),
-            severity=AlertSeverity.WARNING,
-            category="radiation",
-            message=f"Radiation level elevated: {state['radiation']['radiation_level']:.4f} mSv/day",
-            system="radiation"
-        ))
-    
-    # Check structural
-    if state["structural"]["structural_integrity"] < 95.0:
-        new_alerts.append(Alert(
-            id=str(uuid.uuid4()),
-            timestamp=datetime.utcnow(),
-            severity=AlertSeverity.WARNING,
-            category="structural",
-            message=f"Structural integrity below optimal: {state['structural']['structural_integrity']:.2f}%",
-            system="structural"
-        ))
-    
     return new_alerts
 
 @router.get("/alerts")
@@ -99,51 +134,56 @@ async def get_alerts(
     """
     Get all alerts, optionally filtered by severity, system, or resolved status
     """
-    filtered_alerts = alerts_db.copy()
-    
-    if severity:
-        filtered_alerts = [a for a in filtered_alerts if a.severity == severity]
-    
-    if system:
-        filtered_alerts = [a for a in filtered_alerts if a.system == system]
-    
-    if resolved is not None:
-        filtered_alerts = [a for a in filtered_alerts if a.resolved == resolved]
-    
-    # Sort by timestamp (newest first) and limit
-    filtered_alerts.sort(key=lambda x: x.timestamp, reverse=True)
-    filtered_alerts = filtered_alerts[:limit]
-    
+    # alerts_db is appended in timestamp order, so the unfiltered common
+    # path is just the newest entries walked right-to-left — no copy, no sort
+    if severity is None and system is None and resolved is None:
+        filtered_alerts = list(islice(reversed(alerts_db), limit))
+    else:
+        filtered_alerts = alerts_db
+
+        if severity:
+            filtered_alerts = [a for a in filtered_alerts if a.severity == severity]
+
+        if system:
+            filtered_alerts = [a for a in filtered_alerts if a.system == system]
+
+        if resolved is not None:
+            filtered_alerts = [a for a in filtered_alerts if a.resolved == resolved]
+
+        # Newest `limit` first: heap selection is O(N log limit) vs a full
+        # O(N log N) sort, and attrgetter skips per-comparison Python calls
+        filtered_alerts = heapq.nlargest(limit, filtered_alerts, key=_BY_TIMESTAMP)
+
     return {
         "count": len(filtered_alerts),
-        "alerts": [alert.dict() for alert in filtered_alerts]
+        "alerts": [asdict(alert) for alert in filtered_alerts]
     }
 
 @router.get("/alerts/{alert_id}")
 async def get_alert(alert_id: str):
     """Get a specific alert by ID"""
-    alert = next((a for a in alerts_db if a.id == alert_id), None)
+    alert = alerts_by_id.get(alert_id)
     
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
     
-    return alert.dict()
+    return asdict(alert)
 
 @router.post("/alerts/{alert_id}/resolve")
 async def resolve_alert(alert_id: str):
     """Mark an alert as resolved"""
-    alert = next((a for a in alerts_db if a.id == alert_id), None)
+    alert = alerts_by_id.get(alert_id)
     
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
     
     alert.resolved = True
-    return {"message": "Alert resolved", "alert": alert.dict()}
+    return {"message": "Alert resolved", "alert": asdict(alert)}
 
 @router.post("/alerts/generate")
 async def generate_alerts(sensor_simulator: SensorSimulator = Depends(get_sensor_simulator)):
     """Generate new alerts based on current sensor state (internal use)"""
     new_alerts = generate_alert(sensor_simulator)
     if new_alerts:
-        alerts_db.extend(new_alerts)
+        queue_alerts(new_alerts)
     return {"generated": len(new_alerts) if new_alerts else 0}
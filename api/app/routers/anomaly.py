@@ -2,7 +2,8 @@
 Anomaly Detection API endpoints
 """
 from fastapi import APIRouter, HTTPException, Depends
-from app.sensor_simulator import SensorSimulator, get_sensor_simulator
+from fastapi.responses import ORJSONResponse
+from app.sensor_simulator import SensorSimulator, get_sensor_simulator, get_settlement_snapshot
 from app.models import SettlementState, update_settlement_state_from_telemetry, Alert
 from app.anomaly_detector import AnomalyDetector, get_anomaly_detector, AnomalyAlert
 from typing import List
@@ -18,13 +19,10 @@ async def detect_anomalies(
     Detect anomalies in pressure, radiation, and battery using EWMA and z-score
     """
     try:
-        # Get current telemetry
-        telemetry = sensor_simulator.get_current_state()
-        
-        # Create/update settlement state
-        state = SettlementState()
-        state = update_settlement_state_from_telemetry(state, telemetry)
-        
+        # Shared snapshot: reuses the telemetry read done by other
+        # endpoints polled within the same TTL window
+        state = await get_settlement_snapshot(sensor_simulator)
+
         # Detect anomalies
         anomaly_alerts = anomaly_detector.detect_anomalies(
             pressure=state.pressure_kpa,
@@ -46,9 +44,12 @@ async def detect_anomalies(
                     system=anomaly_alert.metric
                 )
                 alerts.append(alert)
-                alerts_module.alerts_db.append(alert)
+            alerts_module.queue_alerts(alerts)
         
-        return {
+        # Direct ORJSONResponse return skips the jsonable_encoder walk;
+        # orjson serializes the nested payload (numpy scalars included)
+        # in one C pass
+        return ORJSONResponse({
             "status": "checked",
             "anomalies_detected": len(anomaly_alerts),
             "anomalies": [
@@ -60,13 +61,13 @@ async def detect_anomalies(
                     "current_value": a.current_value,
                     "z_score": a.z_score,
                     "confidence": a.confidence,
-                    "evidence": a.evidence,
+                    "evidence": a.evidence.to_dict(),
                     "message": a.message,
                     "recommendation": a.recommendation
                 }
                 for a in anomaly_alerts
             ]
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Anomaly detection failed: {str(e)}")
 
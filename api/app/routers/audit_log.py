@@ -1,15 +1,19 @@
 from fastapi import APIRouter, HTTPException, Query
 from app.models import AuditLogEntry
+from dataclasses import asdict
 from app.audit_logger import get_audit_logger
+from app.id_gen import new_id
 from datetime import datetime
-from typing import List, Optional
-import uuid
+from typing import Dict, List, Optional
 
 router = APIRouter()
 
 # Keep in-memory for backward compatibility, but use file-based logger
 audit_log_db: List[AuditLogEntry] = []
 
+# Parallel id -> entry index for O(1) /audit-log/{entry_id} lookups
+audit_log_by_id: Dict[str, AuditLogEntry] = {}
+
 def log_audit_event(
     user: Optional[str],
     action: str,
@@ -23,10 +27,11 @@ def log_audit_event(
     # Log to file (append-only)
     file_entry = audit_logger.log(user, action, resource, status, details)
     
-    # Also create Pydantic model for in-memory compatibility
+    # Also create Pydantic model for in-memory compatibility; the logger
+    # hands back the datetime it stamped, so no ISO parse round trip
     entry = AuditLogEntry(
-        id=str(uuid.uuid4()),
-        timestamp=datetime.fromisoformat(file_entry["timestamp"].replace("Z", "+00:00")),
+        id=new_id(),
+        timestamp=file_entry["timestamp"],
         user=user,
         action=action,
         resource=resource,
@@ -34,6 +39,7 @@ def log_audit_event(
         details=str(details) if details else None
     )
     audit_log_db.append(entry)
+    audit_log_by_id[entry.id] = entry
     return entry
 
 @router.get("/audit-log")
@@ -62,13 +68,18 @@ async def get_audit_log(
             return False
         return True
     
-    # Read from file
-    entries = audit_logger.read_logs(limit=limit + offset, filter_func=filter_func)
-    
-    # Apply pagination
-    total = len(entries)
-    paginated_entries = entries[offset:offset + limit]
-    
+    # read_logs walks the file backward from EOF and stops as soon as
+    # offset+limit matches are found, so only O(limit) entries are ever
+    # decoded
+    paginated_entries = audit_logger.read_logs(limit=limit, offset=offset, filter_func=filter_func)
+
+    # total counts the filtered matches (pagination math depends on it);
+    # the O(1) cached line count only answers the unfiltered case
+    if user or action or resource or status:
+        total = audit_logger.count_matching(filter_func)
+    else:
+        total = audit_logger.get_log_count()
+
     return {
         "total": total,
         "offset": offset,
@@ -80,12 +91,12 @@ async def get_audit_log(
 @router.get("/audit-log/{entry_id}")
 async def get_audit_log_entry(entry_id: str):
     """Get a specific audit log entry by ID"""
-    entry = next((e for e in audit_log_db if e.id == entry_id), None)
+    entry = audit_log_by_id.get(entry_id)
     
     if not entry:
         raise HTTPException(status_code=404, detail="Audit log entry not found")
     
-    return entry.dict()
+    return asdict(entry)
 
 @router.post("/audit-log")
 async def create_audit_log_entry(
@@ -111,4 +122,4 @@ async def create_audit_log_entry(
         )
     
     entry = log_audit_event(user, action, resource, status, details)
-    return entry.dict()
+    return asdict(entry)
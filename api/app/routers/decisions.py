@@ -2,13 +2,61 @@
 Decision Engine API endpoints
 """
 from fastapi import APIRouter, HTTPException, Depends
-from app.sensor_simulator import SensorSimulator, get_sensor_simulator
-from app.models import SettlementState, update_settlement_state_from_telemetry
-from app.decision_engine import DecisionEngine, get_decision_engine
+from fastapi.responses import ORJSONResponse
+from app.sensor_simulator import SensorSimulator, get_sensor_simulator, get_settlement_snapshot
+from app.models import SettlementState
+from dataclasses import astuple
+import asyncio
+from functools import lru_cache
+from app.decision_engine import Category, DecisionEngine, Impact, get_decision_engine
 from typing import List
 
 router = APIRouter()
 
+# Last recommendations list, keyed by snapshot identity. The snapshot object
+# returned by get_settlement_snapshot is shared across endpoints within its
+# TTL window, so an `is` check on it is a tick id: a dashboard hitting all
+# three recommendation endpoints together runs the engine once.
+_recs_cache = (None, None)
+
+async def _compute_recommendations(
+    simulator: SensorSimulator, engine: DecisionEngine
+) -> List:
+    """Generate recommendations for the current shared telemetry snapshot"""
+    global _recs_cache
+    state = await get_settlement_snapshot(simulator)
+    cached_state, recommendations = _recs_cache
+    if cached_state is not state:
+        recommendations = engine.generate_recommendations(state)
+        _recs_cache = (state, recommendations)
+    return recommendations
+
+def _recommendations_response(recommendations: List) -> dict:
+    """Serialize a filtered recommendations list (enums become strings here)"""
+    recommendations_dict = [
+        {
+            "id": r.id,
+            "priority": r.priority,
+            "category": r.category.label,
+            "action": r.action.name,
+            "title": r.title,
+            "description": r.description,
+            "reasoning": r.reasoning,
+            "current_value": r.current_value,
+            "threshold_value": r.threshold_value,
+            "impact": r.impact.label,
+            "estimated_effect": r.estimated_effect,
+            "confidence": r.confidence
+        }
+        for r in recommendations
+    ]
+
+    return {
+        "status": "success",
+        "count": len(recommendations_dict),
+        "recommendations": recommendations_dict
+    }
+
 @router.get("/decisions/recommendations")
 async def get_recommendations(
     category: str = None,  # "life_support" or "energy_dispatch"
@@ -18,52 +66,23 @@ async def get_recommendations(
 ):
     """
     Get ranked recommendations from decision engine
-    
+
     Query params:
         category: Filter by "life_support" or "energy_dispatch"
         min_priority: Minimum priority (1-10) to include
     """
     try:
-        # Get current telemetry
-        telemetry = sensor_simulator.get_current_state()
-        
-        # Create/update settlement state
-        state = SettlementState()
-        state = update_settlement_state_from_telemetry(state, telemetry)
-        
-        # Generate recommendations
-        recommendations = decision_engine.generate_recommendations(state)
-        
-        # Apply filters
+        recommendations = await _compute_recommendations(sensor_simulator, decision_engine)
+
+        # Apply filters (int enum comparison; an unknown category string
+        # maps to None and matches nothing, as before)
         if category:
-            recommendations = [r for r in recommendations if r.category == category]
-        
-        recommendations = [r for r in recommendations if r.priority >= min_priority]
-        
-        # Convert to dict format
-        recommendations_dict = [
-            {
-                "id": r.id,
-                "priority": r.priority,
-                "category": r.category,
-                "action": r.action,
-                "title": r.title,
-                "description": r.description,
-                "reasoning": r.reasoning,
-                "current_value": r.current_value,
-                "threshold_value": r.threshold_value,
-                "impact": r.impact,
-                "estimated_effect": r.estimated_effect,
-                "confidence": r.confidence
-            }
-            for r in recommendations
-        ]
-        
-        return {
-            "status": "success",
-            "count": len(recommendations_dict),
-            "recommendations": recommendations_dict
-        }
+            wanted = Category.__members__.get(category.upper())
+            recommendations = [r for r in recommendations if r.category == wanted]
+
+        return ORJSONResponse(_recommendations_response(
+            [r for r in recommendations if r.priority >= min_priority]
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate recommendations: {str(e)}")
 
@@ -74,7 +93,11 @@ async def get_life_support_recommendations(
     decision_engine: DecisionEngine = Depends(get_decision_engine)
 ):
     """Get life support recommendations only"""
-    return await get_recommendations(category="life_support", min_priority=min_priority)
+    recommendations = await _compute_recommendations(sensor_simulator, decision_engine)
+    return ORJSONResponse(_recommendations_response([
+        r for r in recommendations
+        if r.category == Category.LIFE_SUPPORT and r.priority >= min_priority
+    ]))
 
 @router.get("/decisions/recommendations/energy-dispatch")
 async def get_energy_dispatch_recommendations(
@@ -83,7 +106,11 @@ async def get_energy_dispatch_recommendations(
     decision_engine: DecisionEngine = Depends(get_decision_engine)
 ):
     """Get energy dispatch recommendations only"""
-    return await get_recommendations(category="energy_dispatch", min_priority=min_priority)
+    recommendations = await _compute_recommendations(sensor_simulator, decision_engine)
+    return ORJSONResponse(_recommendations_response([
+        r for r in recommendations
+        if r.category == Category.ENERGY_DISPATCH and r.priority >= min_priority
+    ]))
 
 @router.get("/decisions/thresholds")
 async def get_thresholds():
@@ -104,73 +131,85 @@ async def get_analysis(
     Get comprehensive analysis with current state and recommendations
     """
     try:
-        # Get current telemetry
-        telemetry = sensor_simulator.get_current_state()
-        
-        # Create/update settlement state
-        state = SettlementState()
-        state = update_settlement_state_from_telemetry(state, telemetry)
-        
-        # Generate recommendations
-        recommendations = decision_engine.generate_recommendations(state)
-        
-        # Categorize recommendations
-        life_support_recs = [r for r in recommendations if r.category == "life_support"]
-        energy_recs = [r for r in recommendations if r.category == "energy_dispatch"]
-        
-        # Get highest priority recommendations
-        top_priority = recommendations[0] if recommendations else None
-        
-        return {
-            "status": "success",
-            "current_state": {
-                "o2_pct": state.o2_pct,
-                "co2_ppm": state.co2_ppm,
-                "pressure_kpa": state.pressure_kpa,
-                "temp_c": state.temp_c,
-                "humidity_pct": state.humidity_pct,
-                "solar_kw": state.solar_kw,
-                "battery_kwh": state.battery_kwh,
-                "load_kw": state.load_kw,
-                "crop_health_index": state.crop_health_index,
-                "radiation_msv_hr": state.radiation_msv_hr,
-                "strain_index": state.strain_index
-            },
-            "summary": {
-                "total_recommendations": len(recommendations),
-                "life_support_count": len(life_support_recs),
-                "energy_dispatch_count": len(energy_recs),
-                "highest_priority": top_priority.priority if top_priority else None,
-                "critical_count": len([r for r in recommendations if r.impact == "critical"])
-            },
-            "top_recommendations": [
-                {
-                    "priority": r.priority,
-                    "category": r.category,
-                    "action": r.action,
-                    "title": r.title,
-                    "reasoning": r.reasoning
-                }
-                for r in recommendations[:5]  # Top 5
-            ],
-            "life_support": [
-                {
-                    "priority": r.priority,
-                    "action": r.action,
-                    "title": r.title,
-                    "reasoning": r.reasoning
-                }
-                for r in life_support_recs
-            ],
-            "energy_dispatch": [
-                {
-                    "priority": r.priority,
-                    "action": r.action,
-                    "title": r.title,
-                    "reasoning": r.reasoning
-                }
-                for r in energy_recs
-            ]
-        }
+        # Shared snapshot: concurrent polls within one TTL window reuse the
+        # same telemetry read and state build
+        state = await get_settlement_snapshot(sensor_simulator)
+
+        # The whole response is a pure function of the state fields, so
+        # identical telemetry (dashboards polling within one tick) reuses
+        # the cached payload; a cache miss runs the engine off the event
+        # loop so other requests keep being served meanwhile. Returning
+        # ORJSONResponse directly skips FastAPI's jsonable_encoder walk
+        # over the nested payload — orjson serializes it in one C pass
+        return ORJSONResponse(await asyncio.get_running_loop().run_in_executor(
+            None, _analysis_content, astuple(state), decision_engine
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate analysis: {str(e)}")
+
+@lru_cache(maxsize=256)
+def _analysis_content(state_fields: tuple, decision_engine: DecisionEngine) -> dict:
+    """Build the /decisions/analysis payload for a state field tuple"""
+    state = SettlementState(*state_fields)
+
+    # Generate recommendations
+    recommendations = decision_engine.generate_recommendations(state)
+
+    # Categorize recommendations
+    life_support_recs = [r for r in recommendations if r.category == Category.LIFE_SUPPORT]
+    energy_recs = [r for r in recommendations if r.category == Category.ENERGY_DISPATCH]
+
+    # Get highest priority recommendations
+    top_priority = recommendations[0] if recommendations else None
+
+    return {
+        "status": "success",
+        "current_state": {
+            "o2_pct": state.o2_pct,
+            "co2_ppm": state.co2_ppm,
+            "pressure_kpa": state.pressure_kpa,
+            "temp_c": state.temp_c,
+            "humidity_pct": state.humidity_pct,
+            "solar_kw": state.solar_kw,
+            "battery_kwh": state.battery_kwh,
+            "load_kw": state.load_kw,
+            "crop_health_index": state.crop_health_index,
+            "radiation_msv_hr": state.radiation_msv_hr,
+            "strain_index": state.strain_index
+        },
+        "summary": {
+            "total_recommendations": len(recommendations),
+            "life_support_count": len(life_support_recs),
+            "energy_dispatch_count": len(energy_recs),
+            "highest_priority": top_priority.priority if top_priority else None,
+            "critical_count": len([r for r in recommendations if r.impact == Impact.CRITICAL])
+        },
+        "top_recommendations": [
+            {
+                "priority": r.priority,
+                "category": r.category.label,
+                "action": r.action.name,
+                "title": r.title,
+                "reasoning": r.reasoning
+            }
+            for r in recommendations[:5]  # Top 5
+        ],
+        "life_support": [
+            {
+                "priority": r.priority,
+                "action": r.action.name,
+                "title": r.title,
+                "reasoning": r.reasoning
+            }
+            for r in life_support_recs
+        ],
+        "energy_dispatch": [
+            {
+                "priority": r.priority,
+                "action": r.action.name,
+                "title": r.title,
+                "reasoning": r.reasoning
+            }
+            for r in energy_recs
+        ]
+    }
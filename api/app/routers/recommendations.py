@@ -1,91 +1,129 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.responses import ORJSONResponse
 from app.models import Recommendation
+from dataclasses import asdict
+from app.id_gen import new_id
 from app.sensor_simulator import SensorSimulator, get_sensor_simulator
+from collections import defaultdict, deque
 from datetime import datetime
-from typing import List, Optional
-import uuid
+from typing import Deque, Dict, Iterator, List, Optional
+import numpy as np
 
 router = APIRouter()
 
-# In-memory recommendations storage (in production, use a database)
-recommendations_db: List[Recommendation] = []
+# In-memory recommendations storage (in production, use a database). A
+# bounded ring buffer like the alert store: appends are O(1) and the
+# oldest entries fall off the left once the cap is reached, so memory
+# stays constant regardless of uptime
+_MAX_RECOMMENDATIONS = 10_000
+recommendations_db: Deque[Recommendation] = deque(maxlen=_MAX_RECOMMENDATIONS)
+
+# Priority bucket index over the store. Buckets only see appends on the
+# right and evictions on the left, so each one stays in timestamp order;
+# listings walk the buckets in rank order instead of sorting. Every
+# writer goes through record_recommendations to keep the index in sync.
+_by_priority: Dict[str, Deque[Recommendation]] = defaultdict(deque)
+
+# Recommendations are immutable once created, so their serialized form is
+# invariant: built once here at insertion, reused by every GET instead of
+# re-walking the fields per request
+_dict_by_id: Dict[str, dict] = {}
+
+_PRIO_ORDER = {"high": 3, "medium": 2, "low": 1}
+
+def _bucket_rank(item):
+    return _PRIO_ORDER.get(item[0], 0)
+
+def _newest_first(recs) -> Iterator[Recommendation]:
+    """Walk a timestamp-ordered sequence newest-first, keeping insertion
+    order within runs of equal timestamps (same order a stable reverse
+    sort would produce)"""
+    run: List[Recommendation] = []
+    ts = None
+    for r in reversed(recs):
+        if r.timestamp != ts:
+            yield from reversed(run)
+            run = [r]
+            ts = r.timestamp
+        else:
+            run.append(r)
+    yield from reversed(run)
+
+def record_recommendations(new_recs: List[Recommendation]):
+    """Append recommendations to the store and every index together"""
+    for r in new_recs:
+        # Drop the about-to-be-evicted entry from the indexes so they
+        # track the ring buffer instead of growing forever. The globally
+        # oldest entry is also the oldest in its priority bucket.
+        if len(recommendations_db) == _MAX_RECOMMENDATIONS:
+            evicted = recommendations_db[0]
+            del _dict_by_id[evicted.id]
+            _by_priority[evicted.priority].popleft()
+        recommendations_db.append(r)
+        _by_priority[r.priority].append(r)
+        _dict_by_id[r.id] = asdict(r)
+
+# Threshold table for generate_recommendations, one row per rule. As with
+# the alert table, comparisons are sign-normalized (negated for the
+# above-threshold side) so the whole scan is one vectorized
+# "signed value < threshold". Rotation rate takes two rows — low side and
+# high side — sharing one template; at most one of them can fire.
+_REC_SIGN = np.array([1.0, 1.0, 1.0, 1.0, 1.0, -1.0, 1.0])
+_REC_THRESHOLD = np.array([60.0, 97.0, 80.0, 75.0, 1.85, -1.95, 93.0])
+_REC_TEMPLATES = (
+    ("high", "power", "Increase Solar Power Generation",
+     "Battery charge at {:.2f}%. Consider deploying additional solar arrays or reducing non-essential power consumption.".format, True),
+    ("medium", "life_support", "Optimize Water Recovery System",
+     "Water recovery rate at {:.2f}%. Review filtration systems and check for leaks.".format, False),
+    ("medium", "agriculture", "Improve Crop Health",
+     "Crop health at {:.2f}%. Check nutrient levels, lighting, and irrigation systems.".format, False),
+    ("high", "agriculture", "Replenish Nutrient Solution",
+     "Nutrient levels at {:.2f}%. Add nutrients to maintain optimal crop growth.".format, True),
+    ("high", "structural", "Adjust Rotation Rate",
+     "Rotation rate at {:.2f} RPM. Adjust to maintain 1.9 RPM for optimal gravity.".format, True),
+    ("high", "structural", "Adjust Rotation Rate",
+     "Rotation rate at {:.2f} RPM. Adjust to maintain 1.9 RPM for optimal gravity.".format, True),
+    ("high", "radiation", "Inspect Radiation Shielding",
+     "Shielding effectiveness at {:.2f}%. Inspect and repair shielding layers.".format, True),
+)
 
 def generate_recommendations(sensor_simulator: SensorSimulator) -> List[Recommendation]:
     """Generate recommendations based on current sensor readings"""
     state = sensor_simulator.get_current_state()
+    agriculture = state["agriculture"]
+    rotation_rate = state["structural"]["rotation_rate"]
+
+    values = np.array([
+        state["power"]["battery_charge"],
+        state["life_support"]["water_recovery_rate"],
+        agriculture["crop_health"],
+        agriculture["nutrient_levels"],
+        rotation_rate,
+        rotation_rate,
+        state["radiation"]["shielding_effectiveness"],
+    ])
+
+    # Vectorized scan; on nominal telemetry (the common case) nothing
+    # fires and the pass ends here — no clock read, no ids, no objects
+    fired = (_REC_SIGN * values) < _REC_THRESHOLD
+    if not fired.any():
+        return []
+
+    # One clock read for the whole pass: recommendations generated from
+    # the same telemetry share a timestamp
+    now = datetime.utcnow()
     new_recommendations = []
-    
-    # Power recommendations
-    if state["power"]["battery_charge"] < 60.0:
-        new_recommendations.append(Recommendation(
-            id=str(uuid.uuid4()),
-            timestamp=datetime.utcnow(),
-            priority="high",
-            category="power",
-            title="Increase Solar Power Generation",
-            description=f"Battery charge at {state['power']['battery_charge']:.2f}%. Consider deploying additional solar arrays or reducing non-essential power consumption.",
-            action_required=True
-        ))
-    
-    # Life support recommendations
-    if state["life_support"]["water_recovery_rate"] < 97.0:
-        new_recommendations.append(Recommendation(
-            id=str(uuid.uuid4()),
-            timestamp=datetime.utcnow(),
-            priority="medium",
-            category="life_support",
-            title="Optimize Water Recovery System",
-            description=f"Water recovery rate at {state['life_support']['water_recovery_rate']:.2f}%. Review filtration systems and check for leaks.",
-            action_required=False
-        ))
-    
-    # Agriculture recommendations
-    if state["agriculture"]["crop_health"] < 80.0:
+    for i in np.flatnonzero(fired):
+        priority, category, title, describe, action_required = _REC_TEMPLATES[i]
         new_recommendations.append(Recommendation(
-            id=str(uuid.uuid4()),
-            timestamp=datetime.utcnow(),
-            priority="medium",
-            category="agriculture",
-            title="Improve Crop Health",
-            description=f"Crop health at {state['agriculture']['crop_health']:.2f}%. Check nutrient levels, lighting, and irrigation systems.",
-            action_required=False
+            id=new_id(),
+            timestamp=now,
+            priority=priority,
+            category=category,
+            title=title,
+            description=describe(float(values[i])),
+            action_required=action_required
         ))
-    
-    if state["agriculture"]["nutrient_levels"] < 75.0:
-        new_recommendations.append(Recommendation(
-            id=str(uuid.uuid4()),
-            timestamp=datetime.utcnow(),
-            priority="high",
-            category="agriculture",
-            title="Replenish Nutrient Solution",
-            description=f"Nutrient levels at {state['agriculture']['nutrient_levels']:.2f}%. Add nutrients to maintain optimal crop growth.",
-            action_required=True
-        ))
-    
-    # Structural recommendations
-    if state["structural"]["rotation_rate"] < 1.85 or state["structural"]["rotation_rate"] > 1.95:
-        new_recommendations.append(Recommendation(
-            id=str(uuid.uuid4()),
-            timestamp=datetime.utcnow(),
-            priority="high",
-            category="structural",
-            title="Adjust Rotation Rate",
-            description=f"Rotation rate at {state['structural']['rotation_rate']:.2f} RPM. Adjust to maintain 1.9 RPM for optimal gravity.",
-            action_required=True
-        ))
-    
-    # Radiation recommendations
-    if state["radiation"]["shielding_effectiveness"] < 93.0:
-        new_recommendations.append(Recommendation(
-            id=str(uuid.uuid4()),
-            timestamp=datetime.utcnow(),
-            priority="high",
-            category="radiation",
-            title="Inspect Radiation Shielding",
-            description=f"Shielding effectiveness at {state['radiation']['shielding_effectiveness']:.2f}%. Inspect and repair shielding layers.",
-            action_required=True
-        ))
-    
     return new_recommendations
 
 @router.get("/recommendations")
@@ -98,41 +136,50 @@ async def get_recommendations(
     """
     Get all recommendations, optionally filtered by priority, category, or action required
     """
-    filtered_recs = recommendations_db.copy()
-    
+    # Listings are ordered by (priority rank, recency). The buckets are
+    # already timestamp-ordered, so walking them in rank order and
+    # newest-first yields that ordering directly — no per-element Python
+    # key function and no sort at all, and the walk stops at `limit`
     if priority:
-        filtered_recs = [r for r in filtered_recs if r.priority == priority]
-    
-    if category:
-        filtered_recs = [r for r in filtered_recs if r.category == category]
-    
-    if action_required is not None:
-        filtered_recs = [r for r in filtered_recs if r.action_required == action_required]
-    
-    # Sort by priority (high > medium > low) and timestamp
-    priority_order = {"high": 3, "medium": 2, "low": 1}
-    filtered_recs.sort(key=lambda x: (priority_order.get(x.priority, 0), x.timestamp), reverse=True)
-    filtered_recs = filtered_recs[:limit]
-    
-    return {
+        buckets = [(priority, _by_priority.get(priority, []))]
+    else:
+        buckets = sorted(_by_priority.items(), key=_bucket_rank, reverse=True)
+
+    filtered_recs: List[Recommendation] = []
+    for _, bucket in buckets:
+        if category:
+            bucket = [r for r in bucket if r.category == category]
+        if action_required is not None:
+            bucket = [r for r in bucket if r.action_required == action_required]
+        for rec in _newest_first(bucket):
+            filtered_recs.append(rec)
+            if len(filtered_recs) == limit:
+                break
+        else:
+            continue
+        break
+
+    # Direct ORJSONResponse skips the jsonable_encoder walk; orjson
+    # renders datetimes natively
+    return ORJSONResponse({
         "count": len(filtered_recs),
-        "recommendations": [rec.dict() for rec in filtered_recs]
-    }
+        "recommendations": [_dict_by_id[rec.id] for rec in filtered_recs]
+    })
 
 @router.get("/recommendations/{recommendation_id}")
 async def get_recommendation(recommendation_id: str):
     """Get a specific recommendation by ID"""
-    recommendation = next((r for r in recommendations_db if r.id == recommendation_id), None)
+    recommendation = _dict_by_id.get(recommendation_id)
     
-    if not recommendation:
+    if recommendation is None:
         raise HTTPException(status_code=404, detail="Recommendation not found")
     
-    return recommendation.dict()
+    return ORJSONResponse(recommendation)
 
 @router.post("/recommendations/generate")
 async def generate_recommendations_endpoint(sensor_simulator: SensorSimulator = Depends(get_sensor_simulator)):
     """Generate new recommendations based on current sensor state (internal use)"""
     new_recs = generate_recommendations(sensor_simulator)
     if new_recs:
-        recommendations_db.extend(new_recs)
+        record_recommendations(new_recs)
     return {"generated": len(new_recs) if new_recs else 0}
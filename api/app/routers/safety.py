@@ -1,40 +1,78 @@
 """
 Safety Layer API endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends, Body
+from fastapi import APIRouter, HTTPException, Depends, Body, Query, Response
+from fastapi.responses import ORJSONResponse
+import orjson
 from app.sensor_simulator import SensorSimulator, get_sensor_simulator
-from app.models import SettlementState, update_settlement_state_from_telemetry
-from app.safety_layer import SafetyLayer, get_safety_layer
+from app.models import get_scratch_settlement_state, update_settlement_state_from_telemetry
+from dataclasses import asdict
+from app.safety_layer import (
+    SafetyLayer,
+    get_safety_layer,
+    PRESSURE_LEAK_THRESHOLD,
+    PRESSURE_CRITICAL_THRESHOLD,
+    RADIATION_SPIKE_THRESHOLD,
+    RADIATION_CRITICAL_THRESHOLD,
+)
 from typing import Dict, List
 
 router = APIRouter()
 
+# Thresholds are module constants, so the response is encoded to bytes
+# once at import; the handler just wraps the same bytes object
+_THRESHOLDS_JSON = orjson.dumps({
+    "pressure": {
+        "leak_threshold_percent_per_minute": PRESSURE_LEAK_THRESHOLD,
+        "critical_threshold_kpa": PRESSURE_CRITICAL_THRESHOLD
+    },
+    "radiation": {
+        "spike_threshold_msv_hr": RADIATION_SPIKE_THRESHOLD,
+        "critical_threshold_msv_hr": RADIATION_CRITICAL_THRESHOLD
+    }
+})
+
 @router.post("/safety/check")
 async def check_safety(
+    verbose: bool = Query(False, description="Include full alert/recommendation payloads"),
     sensor_simulator: SensorSimulator = Depends(get_sensor_simulator),
     safety_layer: SafetyLayer = Depends(get_safety_layer)
 ):
     """
     Check safety thresholds and generate alerts/recommendations
+
+    Returns counts and ids by default; pass verbose=true for the full
+    alert and recommendation payloads.
     """
     try:
         # Get current telemetry
         telemetry = sensor_simulator.get_current_state()
         
-        # Create/update settlement state
-        state = SettlementState()
-        state = update_settlement_state_from_telemetry(state, telemetry)
+        # Update the reused scratch state in place (read synchronously
+        # below, never retained)
+        state = update_settlement_state_from_telemetry(get_scratch_settlement_state(), telemetry)
         
         # Check safety
         alerts, recommendations = safety_layer.check_safety(state, telemetry)
         
-        return {
+        if verbose:
+            return ORJSONResponse({
+                "status": "checked",
+                "alerts_generated": len(alerts),
+                "recommendations_generated": len(recommendations),
+                "alerts": [asdict(alert) for alert in alerts],
+                "recommendations": [asdict(rec) for rec in recommendations]
+            })
+
+        # Dashboards polling this endpoint usually only need the counts;
+        # ids let them fetch details on demand
+        return ORJSONResponse({
             "status": "checked",
             "alerts_generated": len(alerts),
             "recommendations_generated": len(recommendations),
-            "alerts": [alert.dict() for alert in alerts],
-            "recommendations": [rec.dict() for rec in recommendations]
-        }
+            "alert_ids": [alert.id for alert in alerts],
+            "recommendation_ids": [rec.id for rec in recommendations]
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Safety check failed: {str(e)}")
 
@@ -113,20 +151,4 @@ async def get_thresholds():
     """
     Get current safety thresholds
     """
-    from app.safety_layer import (
-        PRESSURE_LEAK_THRESHOLD,
-        RADIATION_SPIKE_THRESHOLD,
-        RADIATION_CRITICAL_THRESHOLD,
-        PRESSURE_CRITICAL_THRESHOLD
-    )
-    
-    return {
-        "pressure": {
-            "leak_threshold_percent_per_minute": PRESSURE_LEAK_THRESHOLD,
-            "critical_threshold_kpa": PRESSURE_CRITICAL_THRESHOLD
-        },
-        "radiation": {
-            "spike_threshold_msv_hr": RADIATION_SPIKE_THRESHOLD,
-            "critical_threshold_msv_hr": RADIATION_CRITICAL_THRESHOLD
-        }
-    }
+    return Response(content=_THRESHOLDS_JSON, media_type="application/json")
@@ -1,13 +1,35 @@
 """
 Scenario replay API endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+import orjson
 from app.sensor_simulator import SensorSimulator, get_sensor_simulator
 from app.scenario_engine import ScenarioEngine, get_scenario_engine
 from app.audit_logger import get_audit_logger
 
 router = APIRouter()
 
+# The scenario catalogue is fixed, so its response is encoded to bytes
+# once at import; the handler just wraps the same bytes object
+_SCENARIOS_JSON = orjson.dumps({
+    "scenarios": [
+        {
+            "name": "radiation_storm",
+            "description": "Simulates a radiation storm with spike to 2.0 mSv/hr",
+            "duration_range": {"min": 60, "max": 1800},
+            "default_duration": 300,
+            "triggers": ["radiation alerts", "storm shelter recommendations"]
+        },
+        {
+            "name": "pressure_leak",
+            "description": "Simulates a pressure leak at 2% per minute",
+            "duration_range": {"min": 60, "max": 600},
+            "default_duration": 180,
+            "triggers": ["pressure leak alerts", "compartment isolation recommendations"]
+        }
+    ]
+})
+
 @router.post("/scenarios/radiation-storm")
 async def start_radiation_storm(
     duration: float = Query(300.0, ge=60.0, le=1800.0, description="Duration in seconds (60-1800)"),
@@ -120,21 +142,4 @@ async def list_scenarios():
     """
     List available scenarios
     """
-    return {
-        "scenarios": [
-            {
-                "name": "radiation_storm",
-                "description": "Simulates a radiation storm with spike to 2.0 mSv/hr",
-                "duration_range": {"min": 60, "max": 1800},
-                "default_duration": 300,
-                "triggers": ["radiation alerts", "storm shelter recommendations"]
-            },
-            {
-                "name": "pressure_leak",
-                "description": "Simulates a pressure leak at 2% per minute",
-                "duration_range": {"min": 60, "max": 600},
-                "default_duration": 180,
-                "triggers": ["pressure leak alerts", "compartment isolation recommendations"]
-            }
-        ]
-    }
+    return Response(content=_SCENARIOS_JSON, media_type="application/json")
@@ -1,4 +1,6 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
+from operator import attrgetter
 from app.sensor_simulator import SensorSimulator, get_sensor_simulator
 from app.models import SettlementState, update_settlement_state_from_telemetry
 
@@ -7,6 +9,18 @@ router = APIRouter()
 # Global settlement state instance
 settlement_state = SettlementState()
 
+# Response field list, shared by both endpoints: one C-level multi-attribute
+# fetch instead of eleven hand-typed lookups (and one place to update when
+# SettlementState grows a field)
+_FIELDS = ("o2_pct", "co2_ppm", "pressure_kpa", "temp_c", "humidity_pct",
+           "solar_kw", "battery_kwh", "load_kw", "crop_health_index",
+           "radiation_msv_hr", "strain_index")
+_GET = attrgetter(*_FIELDS)
+
+def _state_dict(state: SettlementState) -> dict:
+    """Serialize a SettlementState for the API response"""
+    return dict(zip(_FIELDS, _GET(state)))
+
 @router.get("/settlement-state")
 async def get_settlement_state(sensor_simulator: SensorSimulator = Depends(get_sensor_simulator)):
     """
@@ -19,23 +33,13 @@ async def get_settlement_state(sensor_simulator: SensorSimulator = Depends(get_s
         # Update settlement state from telemetry
         updated_state = update_settlement_state_from_telemetry(settlement_state, telemetry)
         
-        return {
+        # Direct ORJSONResponse skips the jsonable_encoder walk; every
+        # value below is a plain float or string
+        return ORJSONResponse({
             "status": "operational",
-            "state": {
-                "o2_pct": updated_state.o2_pct,
-                "co2_ppm": updated_state.co2_ppm,
-                "pressure_kpa": updated_state.pressure_kpa,
-                "temp_c": updated_state.temp_c,
-                "humidity_pct": updated_state.humidity_pct,
-                "solar_kw": updated_state.solar_kw,
-                "battery_kwh": updated_state.battery_kwh,
-                "load_kw": updated_state.load_kw,
-                "crop_health_index": updated_state.crop_health_index,
-                "radiation_msv_hr": updated_state.radiation_msv_hr,
-                "strain_index": updated_state.strain_index
-            },
+            "state": _state_dict(updated_state),
             "timestamp": telemetry.get("timestamp")
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve settlement state: {str(e)}")
 
@@ -48,25 +52,14 @@ async def update_settlement_state(
     Update settlement state from a telemetry message
     """
     try:
-        global settlement_state
+        # update_settlement_state_from_telemetry mutates its argument in
+        # place, so the long-lived instance above just gets updated — no
+        # global rebind, no per-request allocation
         updated_state = update_settlement_state_from_telemetry(settlement_state, telemetry)
-        settlement_state = updated_state
-        
-        return {
+
+        return ORJSONResponse({
             "status": "updated",
-            "state": {
-                "o2_pct": updated_state.o2_pct,
-                "co2_ppm": updated_state.co2_ppm,
-                "pressure_kpa": updated_state.pressure_kpa,
-                "temp_c": updated_state.temp_c,
-                "humidity_pct": updated_state.humidity_pct,
-                "solar_kw": updated_state.solar_kw,
-                "battery_kwh": updated_state.battery_kwh,
-                "load_kw": updated_state.load_kw,
-                "crop_health_index": updated_state.crop_health_index,
-                "radiation_msv_hr": updated_state.radiation_msv_hr,
-                "strain_index": updated_state.strain_index
-            }
-        }
+            "state": _state_dict(updated_state)
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update settlement state: {str(e)}")
@@ -1,10 +1,16 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
 from app.sensor_simulator import SensorSimulator, get_sensor_simulator
 from app.models import SystemState
-import uuid
 
 router = APIRouter()
 
+# Valid subsystem names for /state/{system}: frozenset membership test and
+# the error string built once instead of per request
+_VALID_SYSTEMS = frozenset({"atmosphere", "life_support", "power", "radiation",
+                            "agriculture", "structural"})
+_VALID_SYSTEMS_JOINED = ", ".join(sorted(_VALID_SYSTEMS))
+
 @router.get("/state")
 async def get_state(sensor_simulator: SensorSimulator = Depends(get_sensor_simulator)):
     """
@@ -13,11 +19,13 @@ async def get_state(sensor_simulator: SensorSimulator = Depends(get_sensor_simul
     """
     try:
         state = sensor_simulator.get_current_state()
-        return {
+        # Direct ORJSONResponse skips the jsonable_encoder walk over the
+        # telemetry tree; the payload is already plain floats and strings
+        return ORJSONResponse({
             "status": "operational",
             "data": state,
             "timestamp": state.get("timestamp")
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve system state: {str(e)}")
 
@@ -27,12 +35,10 @@ async def get_system_state(system: str, sensor_simulator: SensorSimulator = Depe
     Get state for a specific system
     Systems: atmosphere, life_support, power, radiation, agriculture, structural
     """
-    valid_systems = ["atmosphere", "life_support", "power", "radiation", "agriculture", "structural"]
-    
-    if system not in valid_systems:
+    if system not in _VALID_SYSTEMS:
         raise HTTPException(
             status_code=400, 
-            detail=f"Invalid system. Valid systems: {', '.join(valid_systems)}"
+            detail=f"Invalid system. Valid systems: {_VALID_SYSTEMS_JOINED}"
         )
     
     try:
@@ -42,12 +48,12 @@ async def get_system_state(system: str, sensor_simulator: SensorSimulator = Depe
         if not system_state:
             raise HTTPException(status_code=404, detail=f"System '{system}' state not found")
         
-        return {
+        return ORJSONResponse({
             "status": "operational",
             "system": system,
             "data": system_state,
             "timestamp": full_state.get("timestamp")
-        }
+        })
     except HTTPException:
         raise
     except Exception as e:
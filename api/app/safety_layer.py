@@ -1,11 +1,14 @@
 """
 Safety Layer: Monitors thresholds and generates critical alerts
 """
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+import numpy as np
 from app.models import Alert, AlertSeverity, Recommendation, SettlementState
+from app.id_gen import new_id
 from app.sensor_simulator import SensorSimulator
-import uuid
 
 # Thresholds
 PRESSURE_LEAK_THRESHOLD = 2.0  # 2% per minute
@@ -13,38 +16,126 @@ RADIATION_SPIKE_THRESHOLD = 0.1  # mSv/hr (above normal background)
 RADIATION_CRITICAL_THRESHOLD = 0.5  # mSv/hr (critical level)
 PRESSURE_CRITICAL_THRESHOLD = 90.0  # kPa (critical low pressure)
 
+# Stable bands for the check_safety fast path: values this far inside the
+# thresholds cannot trigger any alert, so the detailed checks are skipped
+SAFE_PRESSURE_BAND = PRESSURE_CRITICAL_THRESHOLD + 10.0  # kPa
+SAFE_RADIATION_BAND = RADIATION_SPIKE_THRESHOLD * 0.5  # mSv/hr
+
 # Alert Types
 ALERT_PRESSURE_LEAK = "PRESSURE_LEAK"
 ALERT_RADIATION_SPIKE = "RADIATION_SPIKE"
 ALERT_RADIATION_CRITICAL = "RADIATION_CRITICAL"
 ALERT_PRESSURE_CRITICAL = "PRESSURE_CRITICAL"
 
+# With only four alert types, active-alert tracking is a bitmask plus a
+# slot array: membership is one bitwise test per tick instead of dict
+# hashing. The public active_alerts property rebuilds the dict view.
+_IDX_PRESSURE_LEAK = 0
+_IDX_PRESSURE_CRITICAL = 1
+_IDX_RADIATION_SPIKE = 2
+_IDX_RADIATION_CRITICAL = 3
+_BIT_PRESSURE_LEAK = 1 << _IDX_PRESSURE_LEAK
+_BIT_PRESSURE_CRITICAL = 1 << _IDX_PRESSURE_CRITICAL
+_BIT_RADIATION_SPIKE = 1 << _IDX_RADIATION_SPIKE
+_BIT_RADIATION_CRITICAL = 1 << _IDX_RADIATION_CRITICAL
+_ALERT_INDEX = {
+    ALERT_PRESSURE_LEAK: _IDX_PRESSURE_LEAK,
+    ALERT_PRESSURE_CRITICAL: _IDX_PRESSURE_CRITICAL,
+    ALERT_RADIATION_SPIKE: _IDX_RADIATION_SPIKE,
+    ALERT_RADIATION_CRITICAL: _IDX_RADIATION_CRITICAL,
+}
+
+# Message templates, formatted with % on fire: the precision specs are
+# parsed once here instead of per alert, and constant threshold values
+# are baked in at import
+_MSG_PRESSURE_CRITICAL = "CRITICAL: Pressure critically low at %.2f kPa"
+_MSG_PRESSURE_LEAK = "PRESSURE LEAK DETECTED: Pressure dropping at %.2f%% per minute"
+_MSG_RADIATION_CRITICAL = (
+    f"CRITICAL: Radiation level at %.4f mSv/hr (threshold: {RADIATION_CRITICAL_THRESHOLD} mSv/hr)"
+)
+_MSG_RADIATION_SPIKE = "Radiation spike detected: %.4f mSv/hr (baseline: %.4f mSv/hr)"
+_DESC_PRESSURE_CRITICAL = (
+    "Pressure has dropped to critical level (%.2f kPa). "
+    "Immediate evacuation to emergency shelters required."
+)
+_DESC_PRESSURE_LEAK = (
+    "Pressure leak detected (dropping at %.2f%% per minute). "
+    "Recommend immediate compartment isolation to prevent further pressure loss."
+)
+_DESC_RADIATION_CRITICAL = (
+    "Radiation level critical (%.4f mSv/hr). "
+    "All personnel must immediately proceed to storm shelters."
+)
+_DESC_RADIATION_SPIKE = (
+    "Radiation spike detected (%.4f mSv/hr). "
+    "Prepare to move to storm shelters if levels continue to rise."
+)
+
 class PressureHistory:
     """Track pressure readings over time"""
-    def __init__(self, max_history_minutes: int = 5):
-        self.readings: List[Tuple[datetime, float]] = []
+    def __init__(self, max_history_minutes: int = 5, capacity: int = 1024):
+        # Struct-of-arrays circular buffer: timestamps (monotonic-clock
+        # floats) and values live in two parallel numpy arrays instead of
+        # a list of tuples, so windowed analytics (std, regression rates)
+        # can run as vector ops without repacking. Wall-clock time only
+        # matters for alert payloads, which check_safety stamps
+        # separately.
+        self._ts = np.empty(capacity, np.float64)
+        self._val = np.empty(capacity, np.float64)
+        self._capacity = capacity
+        self._start = 0  # index of the oldest reading
+        self._n = 0
         self.max_history_minutes = max_history_minutes
+        # The rate only changes when the buffer's endpoints change, so it
+        # is cached for back-to-back readers within one tick
+        self._cached_rate: Optional[float] = None
+        self._dirty = True
+    
+    def __len__(self):
+        return self._n
     
     def add_reading(self, pressure_kpa: float):
         """Add a pressure reading with timestamp"""
-        now = datetime.utcnow()
-        self.readings.append((now, pressure_kpa))
+        now = time.monotonic()
+        if self._n == self._capacity:
+            # Buffer full: overwrite the oldest slot
+            self._start = (self._start + 1) % self._capacity
+            self._n -= 1
+        self._ts[(self._start + self._n) % self._capacity] = now
+        self._val[(self._start + self._n) % self._capacity] = pressure_kpa
+        self._n += 1
+        self._dirty = True
         
-        # Remove old readings (older than max_history_minutes)
-        cutoff_time = now - timedelta(minutes=self.max_history_minutes)
-        self.readings = [(ts, val) for ts, val in self.readings if ts >= cutoff_time]
+        # Readings expire strictly in arrival order, so only the head can
+        # be stale: advance the start index instead of rebuilding anything
+        cutoff_time = now - self.max_history_minutes * 60.0
+        while self._n and self._ts[self._start] < cutoff_time:
+            self._start = (self._start + 1) % self._capacity
+            self._n -= 1
     
     def get_rate_of_change(self) -> Optional[float]:
         """Calculate pressure change rate (% per minute)"""
-        if len(self.readings) < 2:
+        if not self._dirty:
+            return self._cached_rate
+        self._cached_rate = self._compute_rate()
+        self._dirty = False
+        return self._cached_rate
+    
+    def _compute_rate(self) -> Optional[float]:
+        """Rate from the current buffer endpoints (cached by the caller)"""
+        if self._n < 2:
             return None
         
         # Get oldest and newest readings
-        oldest_ts, oldest_pressure = self.readings[0]
-        newest_ts, newest_pressure = self.readings[-1]
+        start = self._start
+        newest = (start + self._n - 1) % self._capacity
+        oldest_ts = self._ts[start]
+        oldest_pressure = self._val[start]
+        newest_ts = self._ts[newest]
+        newest_pressure = self._val[newest]
         
         # Calculate time difference in minutes
-        time_diff = (newest_ts - oldest_ts).total_seconds() / 60.0
+        time_diff = (newest_ts - oldest_ts) / 60.0
         
         if time_diff == 0:
             return None
@@ -56,38 +147,59 @@ class PressureHistory:
         pressure_change_pct = ((newest_pressure - oldest_pressure) / oldest_pressure) * 100.0
         rate_per_minute = pressure_change_pct / time_diff
         
-        return rate_per_minute
+        return float(rate_per_minute)
 
 class RadiationHistory:
     """Track radiation readings"""
     def __init__(self):
         self.baseline: Optional[float] = None
-        self.readings: List[Tuple[datetime, float]] = []
         self.max_readings = 10
+        # Same struct-of-arrays circular buffer as PressureHistory, sized
+        # at the reading cap so eviction is just pointer arithmetic
+        self._ts = np.empty(self.max_readings, np.float64)
+        self._val = np.empty(self.max_readings, np.float64)
+        self._start = 0
+        self._n = 0
+        # Rolling 5-reading window for the baseline: the sum is maintained
+        # incrementally (subtract the evicted value, add the new one)
+        # instead of re-summing the window every tick
+        self._window: Deque[float] = deque(maxlen=5)
+        self._window_sum = 0.0
+    
+    def __len__(self):
+        return self._n
     
     def add_reading(self, radiation_msv_hr: float):
         """Add a radiation reading"""
-        now = datetime.utcnow()
-        self.readings.append((now, radiation_msv_hr))
-        
-        # Keep only recent readings
-        if len(self.readings) > self.max_readings:
-            self.readings = self.readings[-self.max_readings:]
+        now = time.monotonic()
+        if self._n == self.max_readings:
+            self._start = (self._start + 1) % self.max_readings
+            self._n -= 1
+        idx = (self._start + self._n) % self.max_readings
+        self._ts[idx] = now
+        self._val[idx] = radiation_msv_hr
+        self._n += 1
         
         # Update baseline (average of recent readings, excluding spikes)
-        if len(self.readings) >= 5:
-            recent = [r[1] for r in self.readings[-5:]]
-            self.baseline = sum(recent) / len(recent)
+        window = self._window
+        if len(window) == 5:
+            self._window_sum -= window[0]
+        window.append(radiation_msv_hr)
+        self._window_sum += radiation_msv_hr
+        if len(window) == 5:
+            self.baseline = self._window_sum / 5.0
     
-    def is_spike(self, current: float) -> bool:
+    def is_spike(self, current: float,
+                 _r_spike: float = RADIATION_SPIKE_THRESHOLD) -> bool:
         """Check if current reading is a spike above baseline"""
         if self.baseline is None:
             return False
-        return current > (self.baseline + RADIATION_SPIKE_THRESHOLD)
+        return current > (self.baseline + _r_spike)
     
-    def is_critical(self, current: float) -> bool:
+    def is_critical(self, current: float,
+                    _r_crit: float = RADIATION_CRITICAL_THRESHOLD) -> bool:
         """Check if radiation level is critical"""
-        return current >= RADIATION_CRITICAL_THRESHOLD
+        return current >= _r_crit
 
 # Singleton instance
 _safety_layer_instance = None
@@ -105,155 +217,208 @@ class SafetyLayer:
     def __init__(self):
         self.pressure_history = PressureHistory()
         self.radiation_history = RadiationHistory()
-        self.active_alerts: Dict[str, Alert] = {}
+        self._active_mask = 0
+        self._active_alert_objs: List[Optional[Alert]] = [None] * 4
         self.pending_approvals: Dict[str, Dict] = {}
+        # Unapproved subset of pending_approvals, kept in insertion order:
+        # the approvals dashboard polls this, so it shouldn't rescan the
+        # whole approval history as it accumulates
+        self._unapproved: Dict[str, Dict] = {}
     
-    def check_safety(self, state: SettlementState, telemetry: dict) -> Tuple[List[Alert], List[Recommendation]]:
+    @property
+    def active_alerts(self) -> Dict[str, Alert]:
+        """Active alerts keyed by alert type (dict view over the bitmask)"""
+        mask = self._active_mask
+        return {
+            name: self._active_alert_objs[idx]
+            for name, idx in _ALERT_INDEX.items()
+            if mask & (1 << idx)
+        }
+    
+    def check_safety(self, state: SettlementState, telemetry: dict,
+                     _safe_pressure: float = SAFE_PRESSURE_BAND,
+                     _safe_radiation: float = SAFE_RADIATION_BAND,
+                     _p_leak: float = PRESSURE_LEAK_THRESHOLD,
+                     _p_crit: float = PRESSURE_CRITICAL_THRESHOLD) -> Tuple[List[Alert], List[Recommendation]]:
         """
         Check safety thresholds and generate alerts/recommendations
-        
+
+        The trailing underscore arguments bind the module-level thresholds
+        at definition time (LOAD_FAST instead of LOAD_GLOBAL on the hot
+        per-tick path); callers never pass them.
+
         Returns:
             Tuple of (alerts, recommendations)
         """
-        alerts = []
-        recommendations = []
+        # One clock read per check: the history entries and any alerts or
+        # recommendations generated from this tick share a timestamp
+        now = datetime.utcnow()
         
         # Update history
         self.pressure_history.add_reading(state.pressure_kpa)
         self.radiation_history.add_reading(state.radiation_msv_hr)
         
+        # Fast path for nominal telemetry (the common case): comfortably
+        # inside every band, pressure steady, and nothing active to
+        # resolve — no check can fire, so skip them all
+        if (not self._active_mask
+                and state.pressure_kpa > _safe_pressure
+                and state.radiation_msv_hr < _safe_radiation):
+            rate = self.pressure_history.get_rate_of_change()
+            if rate is not None and rate > -_p_leak / 2.0:
+                return [], []
+        
+        alerts = []
+        recommendations = []
+        
         # Check pressure leak
-        pressure_alerts, pressure_recs = self._check_pressure(state)
+        pressure_alerts, pressure_recs = self._check_pressure(state, now)
         alerts.extend(pressure_alerts)
         recommendations.extend(pressure_recs)
         
         # Check critical pressure level
-        if state.pressure_kpa < PRESSURE_CRITICAL_THRESHOLD:
-            alert_id = ALERT_PRESSURE_CRITICAL
-            if alert_id not in self.active_alerts:
+        if state.pressure_kpa < _p_crit:
+            if not self._active_mask & _BIT_PRESSURE_CRITICAL:
                 alert = Alert(
-                    id=str(uuid.uuid4()),
-                    timestamp=datetime.utcnow(),
+                    id=new_id(),
+                    timestamp=now,
                     severity=AlertSeverity.CRITICAL,
                     category="pressure",
-                    message=f"CRITICAL: Pressure critically low at {state.pressure_kpa:.2f} kPa",
+                    message=_MSG_PRESSURE_CRITICAL % state.pressure_kpa,
                     system="atmosphere"
                 )
                 alerts.append(alert)
-                self.active_alerts[alert_id] = alert
+                self._active_mask |= _BIT_PRESSURE_CRITICAL
+                self._active_alert_objs[_IDX_PRESSURE_CRITICAL] = alert
                 
                 # Generate recommendation requiring approval
                 rec = self._create_critical_recommendation(
                     "IMMEDIATE_EVACUATION",
                     "pressure",
                     "Immediate Evacuation Required",
-                    f"Pressure has dropped to critical level ({state.pressure_kpa:.2f} kPa). Immediate evacuation to emergency shelters required.",
+                    _DESC_PRESSURE_CRITICAL % state.pressure_kpa,
+                    now,
                     requires_approval=True
                 )
                 recommendations.append(rec)
         
         # Check radiation
-        radiation_alerts, radiation_recs = self._check_radiation(state)
+        radiation_alerts, radiation_recs = self._check_radiation(state, now)
         alerts.extend(radiation_alerts)
         recommendations.extend(radiation_recs)
         
         return alerts, recommendations
     
-    def _check_pressure(self, state: SettlementState) -> Tuple[List[Alert], List[Recommendation]]:
-        """Check for pressure leaks"""
+    def _check_pressure(self, state: SettlementState, now: datetime,
+                        _p_leak: float = PRESSURE_LEAK_THRESHOLD) -> Tuple[List[Alert], List[Recommendation]]:
+        """Check for pressure leaks (threshold bound at definition time)"""
         alerts = []
         recommendations = []
         
         rate = self.pressure_history.get_rate_of_change()
         
-        if rate is not None and rate < -PRESSURE_LEAK_THRESHOLD:
+        if rate is not None and rate < -_p_leak:
             # Pressure dropping faster than threshold
-            alert_id = ALERT_PRESSURE_LEAK
-            if alert_id not in self.active_alerts:
+            if not self._active_mask & _BIT_PRESSURE_LEAK:
                 alert = Alert(
-                    id=str(uuid.uuid4()),
-                    timestamp=datetime.utcnow(),
+                    id=new_id(),
+                    timestamp=now,
                     severity=AlertSeverity.CRITICAL,
                     category="pressure",
-                    message=f"PRESSURE LEAK DETECTED: Pressure dropping at {abs(rate):.2f}% per minute",
+                    message=_MSG_PRESSURE_LEAK % abs(rate),
                     system="atmosphere"
                 )
                 alerts.append(alert)
-                self.active_alerts[alert_id] = alert
+                self._active_mask |= _BIT_PRESSURE_LEAK
+                self._active_alert_objs[_IDX_PRESSURE_LEAK] = alert
                 
                 # Generate recommendation requiring approval
                 rec = self._create_critical_recommendation(
                     "ISOLATE_COMPARTMENTS",
                     "pressure",
                     "Isolate Compartments",
-                    f"Pressure leak detected (dropping at {abs(rate):.2f}% per minute). Recommend immediate compartment isolation to prevent further pressure loss.",
+                    _DESC_PRESSURE_LEAK % abs(rate),
+                    now,
                     requires_approval=True
                 )
                 recommendations.append(rec)
-        elif ALERT_PRESSURE_LEAK in self.active_alerts and (rate is None or rate >= -PRESSURE_LEAK_THRESHOLD):
+        elif self._active_mask & _BIT_PRESSURE_LEAK and (rate is None or rate >= -_p_leak):
             # Leak resolved
-            del self.active_alerts[ALERT_PRESSURE_LEAK]
+            self._active_mask &= ~_BIT_PRESSURE_LEAK
+            self._active_alert_objs[_IDX_PRESSURE_LEAK] = None
         
         return alerts, recommendations
     
-    def _check_radiation(self, state: SettlementState) -> Tuple[List[Alert], List[Recommendation]]:
+    def _check_radiation(self, state: SettlementState, now: datetime,
+                         _r_spike: float = RADIATION_SPIKE_THRESHOLD,
+                         _r_crit: float = RADIATION_CRITICAL_THRESHOLD) -> Tuple[List[Alert], List[Recommendation]]:
         """Check for radiation spikes"""
         alerts = []
         recommendations = []
         
+        # Both predicates evaluated once up front as plain comparisons
+        # (the RadiationHistory methods stay for external callers; the
+        # per-tick path skips the two extra call frames)
+        current = state.radiation_msv_hr
+        baseline = self.radiation_history.baseline
+        over_crit = current >= _r_crit
+        over_spike = baseline is not None and current > baseline + _r_spike
+        
         # Check for critical radiation level
-        if self.radiation_history.is_critical(state.radiation_msv_hr):
-            alert_id = ALERT_RADIATION_CRITICAL
-            if alert_id not in self.active_alerts:
+        if over_crit:
+            if not self._active_mask & _BIT_RADIATION_CRITICAL:
                 alert = Alert(
-                    id=str(uuid.uuid4()),
-                    timestamp=datetime.utcnow(),
+                    id=new_id(),
+                    timestamp=now,
                     severity=AlertSeverity.CRITICAL,
                     category="radiation",
-                    message=f"CRITICAL: Radiation level at {state.radiation_msv_hr:.4f} mSv/hr (threshold: {RADIATION_CRITICAL_THRESHOLD} mSv/hr)",
+                    message=_MSG_RADIATION_CRITICAL % state.radiation_msv_hr,
                     system="radiation"
                 )
                 alerts.append(alert)
-                self.active_alerts[alert_id] = alert
+                self._active_mask |= _BIT_RADIATION_CRITICAL
+                self._active_alert_objs[_IDX_RADIATION_CRITICAL] = alert
                 
                 # Generate recommendation requiring approval
                 rec = self._create_critical_recommendation(
                     "ACTIVATE_STORM_SHELTER",
                     "radiation",
                     "Activate Storm Shelter Protocol",
-                    f"Radiation level critical ({state.radiation_msv_hr:.4f} mSv/hr). All personnel must immediately proceed to storm shelters.",
+                    _DESC_RADIATION_CRITICAL % state.radiation_msv_hr,
+                    now,
                     requires_approval=True
                 )
                 recommendations.append(rec)
         
         # Check for radiation spike
-        elif self.radiation_history.is_spike(state.radiation_msv_hr):
-            alert_id = ALERT_RADIATION_SPIKE
-            if alert_id not in self.active_alerts:
-                baseline = self.radiation_history.baseline or 0.0
+        elif over_spike:
+            if not self._active_mask & _BIT_RADIATION_SPIKE:
                 alert = Alert(
-                    id=str(uuid.uuid4()),
-                    timestamp=datetime.utcnow(),
+                    id=new_id(),
+                    timestamp=now,
                     severity=AlertSeverity.WARNING,
                     category="radiation",
-                    message=f"Radiation spike detected: {state.radiation_msv_hr:.4f} mSv/hr (baseline: {baseline:.4f} mSv/hr)",
+                    message=_MSG_RADIATION_SPIKE % (current, baseline),
                     system="radiation"
                 )
                 alerts.append(alert)
-                self.active_alerts[alert_id] = alert
+                self._active_mask |= _BIT_RADIATION_SPIKE
+                self._active_alert_objs[_IDX_RADIATION_SPIKE] = alert
                 
                 # Generate recommendation requiring approval
                 rec = self._create_critical_recommendation(
                     "PREPARE_STORM_SHELTER",
                     "radiation",
                     "Prepare Storm Shelter",
-                    f"Radiation spike detected ({state.radiation_msv_hr:.4f} mSv/hr). Prepare to move to storm shelters if levels continue to rise.",
+                    _DESC_RADIATION_SPIKE % state.radiation_msv_hr,
+                    now,
                     requires_approval=True
                 )
                 recommendations.append(rec)
-        elif ALERT_RADIATION_SPIKE in self.active_alerts and not self.radiation_history.is_spike(state.radiation_msv_hr):
+        elif self._active_mask & _BIT_RADIATION_SPIKE and not over_spike:
             # Spike resolved
-            del self.active_alerts[ALERT_RADIATION_SPIKE]
+            self._active_mask &= ~_BIT_RADIATION_SPIKE
+            self._active_alert_objs[_IDX_RADIATION_SPIKE] = None
         
         return alerts, recommendations
     
@@ -263,19 +428,20 @@ class SafetyLayer:
         category: str,
         title: str,
         description: str,
+        now: datetime,
         requires_approval: bool = True
     ) -> Recommendation:
         """Create a critical recommendation that requires human approval"""
-        rec_id = str(uuid.uuid4())
+        rec_id = new_id()
         
         # Store approval requirement
         if requires_approval:
-            self.pending_approvals[rec_id] = {
+            self.pending_approvals[rec_id] = self._unapproved[rec_id] = {
                 "action_id": action_id,
                 "category": category,
                 "title": title,
                 "description": description,
-                "timestamp": datetime.utcnow(),
+                "timestamp": now,
                 "approved": False,
                 "approved_by": None,
                 "approved_at": None
@@ -283,7 +449,7 @@ class SafetyLayer:
         
         return Recommendation(
             id=rec_id,
-            timestamp=datetime.utcnow(),
+            timestamp=now,
             priority="high",
             category=category,
             title=title,
@@ -308,6 +474,7 @@ class SafetyLayer:
         approval["approved"] = True
         approval["approved_by"] = approved_by
         approval["approved_at"] = datetime.utcnow()
+        self._unapproved.pop(recommendation_id, None)
         
         return True
     
@@ -315,8 +482,7 @@ class SafetyLayer:
         """Get all pending approvals"""
         return [
             {**approval, "recommendation_id": rec_id}
-            for rec_id, approval in self.pending_approvals.items()
-            if not approval["approved"]
+            for rec_id, approval in self._unapproved.items()
         ]
     
     def get_approval_status(self, recommendation_id: str) -> Optional[Dict]:
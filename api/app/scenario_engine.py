@@ -2,12 +2,49 @@
 Scenario Engine: Replay mode for predefined scenarios
 """
 import asyncio
-import copy
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, Optional
 from datetime import datetime, timedelta
 from app.sensor_simulator import SensorSimulator
 from app.audit_logger import get_audit_logger
 import math
+import numpy as np
+
+def _radiation_storm_curves(duration_seconds: float, peak_time: float,
+                            base_radiation: float, peak_radiation: float):
+    """
+    Build the per-second radiation and shielding curves for a storm.
+
+    Pure-numeric so it JIT-compiles under numba when available (same
+    fallback pattern as the decision-engine kernels); with cache=True
+    the compiled code persists across runs.
+    """
+    t = np.arange(int(duration_seconds) + 1, dtype=np.float64)
+    decline_duration = duration_seconds - peak_time
+    if decline_duration <= 0:
+        decline_duration = 1.0  # unused: the loop ends before the decline phase
+    log_ratio = math.log(peak_radiation / base_radiation)
+    rise = base_radiation * np.exp((t / peak_time) * log_ratio)
+    decline = peak_radiation * np.exp(-((t - peak_time) / decline_duration) * 2.0)
+    radiation = np.where(t < peak_time, rise, decline)
+    shielding = np.maximum(70.0, 95.0 - (radiation / peak_radiation) * 25.0)
+    return radiation, shielding
+
+def _pressure_leak_curves(duration_seconds: float, initial_pressure: float,
+                          leak_rate_per_second: float):
+    """Build the per-second pressure decay and CO2 creep curves for a leak"""
+    t = np.arange(int(duration_seconds) + 1, dtype=np.float64)
+    pressure = np.maximum(10.0, initial_pressure * np.exp(-leak_rate_per_second * t))
+    co2 = np.minimum(0.1, 0.04 + (t - 30.0) / 60.0 * 0.01)
+    return pressure, co2
+
+# JIT-compile the curve builders when numba is available; the pure-Python
+# definitions above are the fallback
+try:
+    from numba import njit
+    _radiation_storm_curves = njit(cache=True)(_radiation_storm_curves)
+    _pressure_leak_curves = njit(cache=True)(_pressure_leak_curves)
+except ImportError:
+    pass
 
 class ScenarioEngine:
     """Engine for running predefined scenarios"""
@@ -18,8 +55,16 @@ class ScenarioEngine:
         self.active_scenario: Optional[str] = None
         self.scenario_start_time: Optional[datetime] = None
         self.scenario_duration: float = 0.0
-        self.original_state = None
-        self._scenario_task: Optional[asyncio.Task] = None
+        # Each scenario only mutates one submodel, so only that submodel
+        # is snapshotted for restore (deep-copying the whole state tree
+        # walked every unrelated submodel)
+        self._saved_radiation = None
+        self._saved_atmosphere = None
+        # All active scenario runs share one 1 Hz ticker coroutine: each
+        # run registers an apply(second) callback plus a finalize hook,
+        # so asyncio wakeups stay O(1) in the number of scenarios
+        self._runs: Dict[str, Dict[str, Any]] = {}
+        self._ticker_task: Optional[asyncio.Task] = None
     
     async def run_radiation_storm_scenario(self, duration_seconds: float = 300.0):
         """
@@ -50,14 +95,50 @@ class ScenarioEngine:
             }
         )
         
-        # Save original state (deep copy)
-        self.original_state = copy.deepcopy(self.sensor_simulator.current_state)
+        # Save the one submodel this scenario mutates
+        self._saved_radiation = self.sensor_simulator.current_state.radiation.model_copy(deep=True)
         
-        # Run scenario
-        self._scenario_task = asyncio.create_task(
-            self._execute_radiation_storm(duration_seconds)
+        # Precompute both curves once (one value per second): the whole
+        # storm is a closed-form function of elapsed seconds, which also
+        # makes a replay of a given duration deterministic
+        peak_time = 60.0  # Peak at 60 seconds
+        base_radiation = 0.02  # Normal: 0.02 mSv/hr
+        peak_radiation = 2.0  # Peak: 2.0 mSv/hr (100x normal)
+        radiation_curve, shielding_curve = _radiation_storm_curves(
+            duration_seconds, peak_time, base_radiation, peak_radiation
         )
         
+        radiation = self.sensor_simulator.current_state.radiation
+        
+        def apply(second: int):
+            # Apply radiation spike (converted to mSv/day) and reduced
+            # shielding effectiveness during the storm
+            radiation.radiation_level = float(radiation_curve[second]) * 24.0
+            radiation.shielding_effectiveness = float(shielding_curve[second])
+        
+        def finalize():
+            # Restore original state
+            if self._saved_radiation is not None:
+                self.sensor_simulator.current_state.radiation = self._saved_radiation
+                self._saved_radiation = None
+            
+            self.active_scenario = None
+            self.scenario_start_time = None
+            
+            # Log scenario end
+            self.audit_logger.log(
+                user="system",
+                action="SCENARIO_END",
+                resource="sensor_simulator",
+                status="success",
+                details={
+                    "scenario": "radiation_storm",
+                    "duration_seconds": duration_seconds
+                }
+            )
+        
+        self._register_run("radiation_storm", int(duration_seconds), apply, finalize)
+        
         return {
             "status": "started",
             "scenario": "radiation_storm",
@@ -93,66 +174,34 @@ class ScenarioEngine:
             }
         )
         
-        # Save original state (deep copy)
-        self.original_state = copy.deepcopy(self.sensor_simulator.current_state)
+        # Save the one submodel this scenario mutates
+        self._saved_atmosphere = self.sensor_simulator.current_state.atmosphere.model_copy(deep=True)
         
-        # Run scenario
-        self._scenario_task = asyncio.create_task(
-            self._execute_pressure_leak(duration_seconds)
+        # Precompute the decay and CO2 curves once (one value per second):
+        # P(t) = P0 * e^(-r*t) floored at 10 psi, and CO2 creeping up from
+        # 30 s onward as scrubbing efficiency falls
+        atmosphere = self.sensor_simulator.current_state.atmosphere
+        initial_pressure = atmosphere.pressure  # psi
+        leak_rate_per_minute = 0.02  # 2% per minute
+        leak_rate_per_second = leak_rate_per_minute / 60.0
+        pressure_curve, co2_curve = _pressure_leak_curves(
+            duration_seconds, initial_pressure, leak_rate_per_second
         )
         
-        return {
-            "status": "started",
-            "scenario": "pressure_leak",
-            "duration_seconds": duration_seconds
-        }
-    
-    async def _execute_radiation_storm(self, duration_seconds: float):
-        """Execute radiation storm scenario"""
-        start_time = datetime.utcnow()
-        peak_time = 60.0  # Peak at 60 seconds
-        base_radiation = 0.02  # Normal: 0.02 mSv/hr
-        peak_radiation = 2.0  # Peak: 2.0 mSv/hr (100x normal)
-        
-        try:
-            while True:
-                elapsed = (datetime.utcnow() - start_time).total_seconds()
-                
-                if elapsed >= duration_seconds:
-                    break
-                
-                # Calculate radiation level based on time
-                if elapsed < peak_time:
-                    # Rising phase: exponential rise to peak
-                    progress = elapsed / peak_time
-                    # Exponential curve: e^(x*ln(peak/base))
-                    factor = math.exp(progress * math.log(peak_radiation / base_radiation))
-                    radiation = base_radiation * factor
-                else:
-                    # Declining phase: exponential decay
-                    decline_time = elapsed - peak_time
-                    decline_duration = duration_seconds - peak_time
-                    progress = decline_time / decline_duration
-                    # Exponential decay
-                    radiation = peak_radiation * math.exp(-progress * 2.0)
-                
-                # Apply radiation spike
-                self.sensor_simulator.current_state.radiation.radiation_level = radiation * 24.0  # Convert to mSv/day
-                
-                # Reduce shielding effectiveness during storm
-                self.sensor_simulator.current_state.radiation.shielding_effectiveness = max(
-                    70.0,
-                    95.0 - (radiation / peak_radiation) * 25.0
-                )
-                
-                await asyncio.sleep(1.0)  # Update every second
+        def apply(second: int):
+            # Apply pressure drop
+            atmosphere.pressure = float(pressure_curve[second])
+            
+            # Slight increase in CO2 as pressure drops (less efficient
+            # scrubbing), starting after 30 seconds
+            if second > 30:
+                atmosphere.co2_level = float(co2_curve[second])
         
-        except asyncio.CancelledError:
-            pass
-        finally:
+        def finalize():
             # Restore original state
-            if self.original_state:
-                self.sensor_simulator.current_state.radiation = self.original_state.radiation
+            if self._saved_atmosphere is not None:
+                self.sensor_simulator.current_state.atmosphere = self._saved_atmosphere
+                self._saved_atmosphere = None
             
             self.active_scenario = None
             self.scenario_start_time = None
@@ -164,72 +213,64 @@ class ScenarioEngine:
                 resource="sensor_simulator",
                 status="success",
                 details={
-                    "scenario": "radiation_storm",
+                    "scenario": "pressure_leak",
                     "duration_seconds": duration_seconds
                 }
             )
+        
+        self._register_run("pressure_leak", int(duration_seconds), apply, finalize)
+        
+        return {
+            "status": "started",
+            "scenario": "pressure_leak",
+            "duration_seconds": duration_seconds
+        }
     
-    async def _execute_pressure_leak(self, duration_seconds: float):
-        """Execute pressure leak scenario"""
-        start_time = datetime.utcnow()
-        initial_pressure = self.sensor_simulator.current_state.atmosphere.pressure  # psi
-        leak_rate_per_minute = 0.02  # 2% per minute
-        leak_rate_per_second = leak_rate_per_minute / 60.0
+    def _register_run(self, name: str, ticks: int,
+                      apply: Callable[[int], None], finalize: Callable[[], None]):
+        """Register a scenario run and make sure the shared ticker is up"""
+        self._runs[name] = {"ticks": ticks, "index": 0,
+                            "apply": apply, "finalize": finalize}
+        if self._ticker_task is None or self._ticker_task.done():
+            self._ticker_task = asyncio.create_task(self._run_ticker())
+    
+    def _finish_run(self, name: str):
+        """Unregister a run and restore/log through its finalize hook"""
+        run = self._runs.pop(name, None)
+        if run is not None:
+            run["finalize"]()
+    
+    async def _run_ticker(self):
+        """
+        Single 1 Hz ticker driving every active scenario run.
         
+        Counter-driven and paced against absolute deadlines on the event
+        loop's monotonic clock: no wall-clock read per second, no drift
+        from sleep jitter, and one coroutine regardless of how many
+        scenarios are active.
+        """
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
         try:
-            while True:
-                elapsed = (datetime.utcnow() - start_time).total_seconds()
-                
-                if elapsed >= duration_seconds:
-                    break
-                
-                # Calculate pressure drop
-                # Pressure decreases exponentially: P(t) = P0 * e^(-r*t)
-                # where r is the leak rate per second
-                current_pressure = initial_pressure * math.exp(-leak_rate_per_second * elapsed)
-                
-                # Apply pressure drop
-                self.sensor_simulator.current_state.atmosphere.pressure = max(
-                    10.0,  # Don't go below 10 psi (critical)
-                    current_pressure
-                )
-                
-                # Slight increase in CO2 as pressure drops (less efficient scrubbing)
-                if elapsed > 30:  # After 30 seconds
-                    co2_increase = (elapsed - 30) / 60.0 * 0.01  # Gradual increase
-                    self.sensor_simulator.current_state.atmosphere.co2_level = min(
-                        0.1,  # Max 0.1%
-                        0.04 + co2_increase
-                    )
-                
-                await asyncio.sleep(1.0)  # Update every second
-        
+            while self._runs:
+                for name, run in list(self._runs.items()):
+                    if run["index"] >= run["ticks"]:
+                        self._finish_run(name)
+                        continue
+                    run["apply"](run["index"])
+                    run["index"] += 1
+                next_tick += 1.0
+                await asyncio.sleep(max(0.0, next_tick - loop.time()))
         except asyncio.CancelledError:
             pass
         finally:
-            # Restore original state
-            if self.original_state:
-                self.sensor_simulator.current_state.atmosphere = self.original_state.atmosphere
-            
-            self.active_scenario = None
-            self.scenario_start_time = None
-            
-            # Log scenario end
-            self.audit_logger.log(
-                user="system",
-                action="SCENARIO_END",
-                resource="sensor_simulator",
-                status="success",
-                details={
-                    "scenario": "pressure_leak",
-                    "duration_seconds": duration_seconds
-                }
-            )
+            for name in list(self._runs):
+                self._finish_run(name)
     
     def stop_scenario(self):
         """Stop the currently running scenario"""
-        if self._scenario_task and not self._scenario_task.done():
-            self._scenario_task.cancel()
+        if self._ticker_task and not self._ticker_task.done():
+            self._ticker_task.cancel()
         
         if self.active_scenario:
             scenario_name = self.active_scenario
@@ -1,12 +1,106 @@
 import asyncio
-import random
+import time
 from datetime import datetime
 from typing import Dict, Any
-from app.models import SystemState
+import numpy as np
+import orjson
+from app.models import SystemState, SettlementState, update_settlement_state_from_telemetry
+
+# Per-tick noise model for the 19 plain mean/sigma sensor fields, one row
+# per column so the whole tick is a single vectorized draw + clip instead
+# of ~20 random.gauss calls through the interpreter. Field order:
+#   oxygen_level, co2_level, pressure, temperature, humidity,
+#   water_recovery_rate, waste_processing_efficiency, air_quality_index,
+#   battery_charge, power_consumption, energy_storage_level,
+#   radiation_level, shielding_effectiveness,
+#   crop_health, nutrient_levels, harvest_readiness,
+#   rotation_rate, structural_integrity, module_pressure
+# (solar_generation combines two draws non-linearly and stays scalar)
+_SENSOR_MEAN = np.array([21.0, 0.04, 14.7, 20.0, 50.0,
+                         98.0, 95.0, 95.0,
+                         80.0, 800.0, 80.0,
+                         0.5, 95.0,
+                         85.0, 80.0, 60.0,
+                         1.9, 98.0, 14.7])
+_SENSOR_SIGMA = np.array([0.3, 0.005, 0.1, 1.0, 2.5,
+                          0.5, 1.0, 2.0,
+                          5.0, 30.0, 3.0,
+                          0.05, 1.0,
+                          3.0, 4.0, 5.0,
+                          0.02, 0.5, 0.05])
+_SENSOR_LO = np.array([19.0, 0.03, 14.0, 18.0, 45.0,
+                       96.0, 92.0, 90.0,
+                       60.0, 700.0, 70.0,
+                       0.3, 92.0,
+                       75.0, 70.0, 40.0,
+                       1.85, 96.0, 14.5])
+_SENSOR_HI = np.array([23.0, 0.05, 15.5, 22.0, 55.0,
+                       99.5, 97.0, 100.0,
+                       100.0, 900.0, 95.0,
+                       0.7, 98.0,
+                       95.0, 90.0, 80.0,
+                       1.95, 100.0, 14.9])
+# Frozen: these are shared read-only tables, and a stray in-place write
+# would silently skew every subsequent reading
+for _arr in (_SENSOR_MEAN, _SENSOR_SIGMA, _SENSOR_LO, _SENSOR_HI):
+    _arr.setflags(write=False)
+del _arr
+
+# Fused mean + sigma * noise + clip kernel, JIT-compiled under numba
+# (same guard as the decision-engine kernels); the fallback is the
+# equivalent vectorized numpy expression rather than the scalar loop,
+# which would be slower under the interpreter
+try:
+    from numba import njit
+
+    @njit(cache=True, fastmath=True)
+    def _tick_noise_kernel(mean, sigma, lo, hi, noise, out):
+        for i in range(mean.shape[0]):
+            v = mean[i] + sigma[i] * noise[i]
+            if v < lo[i]:
+                v = lo[i]
+            elif v > hi[i]:
+                v = hi[i]
+            out[i] = v
+except ImportError:
+    def _tick_noise_kernel(mean, sigma, lo, hi, noise, out):
+        np.clip(mean + sigma * noise, lo, hi, out=out)
 
 # Singleton instance
 _sensor_simulator_instance = None
 
+# Shared telemetry -> SettlementState snapshot. Endpoints polled together by
+# a dashboard (analysis, anomaly detection, recommendations) all read the
+# same 1 Hz telemetry, so one snapshot per TTL window serves all of them.
+_SNAPSHOT_TTL_S = 0.2
+_snapshot_lock = asyncio.Lock()
+_snapshot = (0.0, None)
+
+async def get_settlement_snapshot(simulator: 'SensorSimulator') -> SettlementState:
+    """
+    Get the current SettlementState, rebuilt from telemetry at most once
+    per 200 ms.
+
+    The lock means concurrent requests landing in the same window do the
+    telemetry read and state build exactly once; the rest reuse the
+    cached state.
+    """
+    global _snapshot
+    built_at, state = _snapshot
+    if state is not None and time.monotonic() - built_at < _SNAPSHOT_TTL_S:
+        return state
+    async with _snapshot_lock:
+        built_at, state = _snapshot
+        now = time.monotonic()
+        if state is None or now - built_at >= _SNAPSHOT_TTL_S:
+            telemetry = simulator.get_current_state()
+            # Each rebuild allocates a fresh instance: downstream caches
+            # (decision recommendations) key on snapshot identity, so a
+            # reused object would pin their first result forever
+            state = update_settlement_state_from_telemetry(SettlementState(), telemetry)
+            _snapshot = (now, state)
+    return state
+
 def get_sensor_simulator() -> 'SensorSimulator':
     """Get the singleton sensor simulator instance"""
     global _sensor_simulator_instance
@@ -14,164 +108,213 @@ def get_sensor_simulator() -> 'SensorSimulator':
         _sensor_simulator_instance = SensorSimulator()
     return _sensor_simulator_instance
 
+# The telemetry dict only changes when the sensors tick (1 Hz) or a
+# scenario writes into current_state, but several endpoints plus the
+# periodic tasks each rebuild it — a clock read and ~20 round() calls —
+# for the same reading. Cache the built dict briefly; the TTL is well
+# under the update cadence, so scenario writes still surface within
+# 100 ms while a burst of callers in one tick shares a single build.
+_STATE_CACHE_TTL_S = 0.1
+
 class SensorSimulator:
     """Simulates space settlement sensors and generates telemetry data at 1 Hz"""
-    
+
+    # Attribute access on the simulator happens every tick and on every
+    # telemetry read; slots turn those into fixed-offset loads and drop
+    # the per-instance __dict__
+    __slots__ = ("running", "current_state", "_task", "_state_dict",
+                 "_state_fresh", "_state_cache_at", "_ts_iso", "_ts_iso_at",
+                 "telemetry_json", "_tick_event", "_rng", "_noise", "_vals")
+
     def __init__(self):
         self.running = False
         self.current_state = SystemState()
         self._task = None
+        # The telemetry dict is allocated once and refreshed in place:
+        # callers get the same nested dict every time (read-only by
+        # contract), so a cache hit allocates nothing and a refresh only
+        # rewrites the leaf floats
+        self._state_dict: Dict[str, Any] = {
+            "timestamp": "",
+            "atmosphere": {"oxygen_level": 0.0, "co2_level": 0.0, "pressure": 0.0,
+                           "temperature": 0.0, "humidity": 0.0},
+            "life_support": {"water_recovery_rate": 0.0, "waste_processing_efficiency": 0.0,
+                             "air_quality_index": 0.0},
+            "power": {"solar_generation": 0.0, "battery_charge": 0.0,
+                      "power_consumption": 0.0, "energy_storage_level": 0.0},
+            "radiation": {"radiation_level": 0.0, "shielding_effectiveness": 0.0},
+            "agriculture": {"crop_health": 0.0, "nutrient_levels": 0.0,
+                            "harvest_readiness": 0.0},
+            "structural": {"rotation_rate": 0.0, "structural_integrity": 0.0,
+                           "module_pressure": 0.0},
+        }
+        self._state_fresh = False
+        self._state_cache_at = 0.0
+        # The isoformat timestamp is reformatted at most once per second:
+        # sensors tick at 1 Hz, so finer granularity only costs datetime
+        # allocations without carrying information
+        self._ts_iso = ""
+        self._ts_iso_at = -1.0
+        # Telemetry is serialized to JSON once per tick and fanned out to
+        # every streaming client: N clients cost N sends, not N encodes.
+        # wait_for_tick blocks consumers until the next publish.
+        self.telemetry_json: bytes = b""
+        self._tick_event = asyncio.Event()
+        # numpy Generator (ziggurat): one batched draw per tick replaces
+        # ~20 scalar random.gauss calls. The noise and output buffers are
+        # pre-allocated and reused every tick.
+        self._rng = np.random.default_rng()
+        self._noise = np.empty(21, np.float64)
+        self._vals = np.empty(19, np.float64)
         
     def get_current_state(self) -> Dict[str, Any]:
-        """Get current sensor readings"""
-        return {
-            "timestamp": datetime.utcnow().isoformat(),
-            "atmosphere": {
-                "oxygen_level": round(self.current_state.atmosphere.oxygen_level, 2),
-                "co2_level": round(self.current_state.atmosphere.co2_level, 4),
-                "pressure": round(self.current_state.atmosphere.pressure, 2),
-                "temperature": round(self.current_state.atmosphere.temperature, 2),
-                "humidity": round(self.current_state.atmosphere.humidity, 2)
-            },
-            "life_support": {
-                "water_recovery_rate": round(self.current_state.life_support.water_recovery_rate, 2),
-                "waste_processing_efficiency": round(self.current_state.life_support.waste_processing_efficiency, 2),
-                "air_quality_index": round(self.current_state.life_support.air_quality_index, 2)
-            },
-            "power": {
-                "solar_generation": round(self.current_state.power.solar_generation, 2),
-                "battery_charge": round(self.current_state.power.battery_charge, 2),
-                "power_consumption": round(self.current_state.power.power_consumption, 2),
-                "energy_storage_level": round(self.current_state.power.energy_storage_level, 2)
-            },
-            "radiation": {
-                "radiation_level": round(self.current_state.radiation.radiation_level, 4),
-                "shielding_effectiveness": round(self.current_state.radiation.shielding_effectiveness, 2)
-            },
-            "agriculture": {
-                "crop_health": round(self.current_state.agriculture.crop_health, 2),
-                "nutrient_levels": round(self.current_state.agriculture.nutrient_levels, 2),
-                "harvest_readiness": round(self.current_state.agriculture.harvest_readiness, 2)
-            },
-            "structural": {
-                "rotation_rate": round(self.current_state.structural.rotation_rate, 2),
-                "structural_integrity": round(self.current_state.structural.structural_integrity, 2),
-                "module_pressure": round(self.current_state.structural.module_pressure, 2)
-            }
-        }
+        """Get current sensor readings (cached per tick window; treat as read-only)"""
+        now = time.monotonic()
+        if self._state_fresh and now - self._state_cache_at < _STATE_CACHE_TTL_S:
+            return self._state_dict
+        self._refresh_state_dict()
+        self._state_fresh = True
+        self._state_cache_at = now
+        return self._state_dict
+
+    def _refresh_state_dict(self, _round=round):
+        """Rewrite the telemetry dict's leaves from current_state"""
+        # Rounding happens here rather than in _tick_sensors because
+        # scenarios write into current_state directly; reading through
+        # current_state keeps those overrides visible. round itself is
+        # bound as a default argument: 22 LOAD_FAST instead of 22
+        # builtin lookups per refresh.
+        state = self._state_dict
+        now = time.monotonic()
+        if now - self._ts_iso_at >= 1.0:
+            self._ts_iso = datetime.utcnow().isoformat()
+            self._ts_iso_at = now
+        state["timestamp"] = self._ts_iso
+
+        atmosphere = self.current_state.atmosphere
+        d = state["atmosphere"]
+        d["oxygen_level"] = _round(atmosphere.oxygen_level, 2)
+        d["co2_level"] = _round(atmosphere.co2_level, 4)
+        d["pressure"] = _round(atmosphere.pressure, 2)
+        d["temperature"] = _round(atmosphere.temperature, 2)
+        d["humidity"] = _round(atmosphere.humidity, 2)
+
+        life_support = self.current_state.life_support
+        d = state["life_support"]
+        d["water_recovery_rate"] = _round(life_support.water_recovery_rate, 2)
+        d["waste_processing_efficiency"] = _round(life_support.waste_processing_efficiency, 2)
+        d["air_quality_index"] = _round(life_support.air_quality_index, 2)
+
+        power = self.current_state.power
+        d = state["power"]
+        d["solar_generation"] = _round(power.solar_generation, 2)
+        d["battery_charge"] = _round(power.battery_charge, 2)
+        d["power_consumption"] = _round(power.power_consumption, 2)
+        d["energy_storage_level"] = _round(power.energy_storage_level, 2)
+
+        radiation = self.current_state.radiation
+        d = state["radiation"]
+        d["radiation_level"] = _round(radiation.radiation_level, 4)
+        d["shielding_effectiveness"] = _round(radiation.shielding_effectiveness, 2)
+
+        agriculture = self.current_state.agriculture
+        d = state["agriculture"]
+        d["crop_health"] = _round(agriculture.crop_health, 2)
+        d["nutrient_levels"] = _round(agriculture.nutrient_levels, 2)
+        d["harvest_readiness"] = _round(agriculture.harvest_readiness, 2)
+
+        structural = self.current_state.structural
+        d = state["structural"]
+        d["rotation_rate"] = _round(structural.rotation_rate, 2)
+        d["structural_integrity"] = _round(structural.structural_integrity, 2)
+        d["module_pressure"] = _round(structural.module_pressure, 2)
     
     async def _update_sensors(self):
         """Continuously update sensor readings"""
+        # Paced against absolute deadlines on the event loop's monotonic
+        # clock (like the scenario ticker): sleeping for the remainder of
+        # each 1 s slot instead of a flat second keeps the cadence at
+        # exactly 1 Hz regardless of per-tick work time
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
         while self.running:
             # Simulate realistic sensor variations
-            self._update_atmosphere()
-            self._update_life_support()
-            self._update_power()
-            self._update_radiation()
-            self._update_agriculture()
-            self._update_structural()
-            
-            await asyncio.sleep(1.0)  # Update at 1 Hz
-    
-    def _update_atmosphere(self):
-        """Update atmosphere sensor readings"""
-        # Oxygen: target 21%, vary ±0.5%
-        self.current_state.atmosphere.oxygen_level = max(19.0, min(23.0, 
-            21.0 + random.gauss(0, 0.3)))
-        
-        # CO2: target 0.04%, vary ±0.01%
-        self.current_state.atmosphere.co2_level = max(0.03, min(0.05,
-            0.04 + random.gauss(0, 0.005)))
-        
-        # Pressure: target 14.7 psi, vary ±0.2 psi
-        self.current_state.atmosphere.pressure = max(14.0, min(15.5,
-            14.7 + random.gauss(0, 0.1)))
-        
-        # Temperature: target 20°C, vary ±2°C
-        self.current_state.atmosphere.temperature = max(18.0, min(22.0,
-            20.0 + random.gauss(0, 1.0)))
-        
-        # Humidity: target 50%, vary ±5%
-        self.current_state.atmosphere.humidity = max(45.0, min(55.0,
-            50.0 + random.gauss(0, 2.5)))
-    
-    def _update_life_support(self):
-        """Update life support system readings"""
-        # Water recovery: target 98%, vary ±1%
-        self.current_state.life_support.water_recovery_rate = max(96.0, min(99.5,
-            98.0 + random.gauss(0, 0.5)))
-        
-        # Waste processing: target 95%, vary ±2%
-        self.current_state.life_support.waste_processing_efficiency = max(92.0, min(97.0,
-            95.0 + random.gauss(0, 1.0)))
-        
-        # Air quality: target 95, vary ±3
-        self.current_state.life_support.air_quality_index = max(90.0, min(100.0,
-            95.0 + random.gauss(0, 2.0)))
-    
-    def _update_power(self):
-        """Update power system readings"""
-        # Solar generation: target 1 MW, vary ±50 kW (day/night cycle simulation)
-        base_power = 1000.0
-        time_factor = 0.7 + 0.3 * abs(random.gauss(0, 0.3))  # Simulate day/night
-        self.current_state.power.solar_generation = max(0.0, min(1100.0,
-            base_power * time_factor + random.gauss(0, 30.0)))
-        
-        # Battery charge: target 80%, vary ±10%
-        self.current_state.power.battery_charge = max(60.0, min(100.0,
-            80.0 + random.gauss(0, 5.0)))
-        
-        # Power consumption: target 800 kW, vary ±50 kW
-        self.current_state.power.power_consumption = max(700.0, min(900.0,
-            800.0 + random.gauss(0, 30.0)))
-        
-        # Energy storage: target 80%, vary ±5%
-        self.current_state.power.energy_storage_level = max(70.0, min(95.0,
-            80.0 + random.gauss(0, 3.0)))
-    
-    def _update_radiation(self):
-        """Update radiation sensor readings"""
-        # Radiation level: target 0.5 mSv/day, vary ±0.1 mSv
-        self.current_state.radiation.radiation_level = max(0.3, min(0.7,
-            0.5 + random.gauss(0, 0.05)))
-        
-        # Shielding effectiveness: target 95%, vary ±2%
-        self.current_state.radiation.shielding_effectiveness = max(92.0, min(98.0,
-            95.0 + random.gauss(0, 1.0)))
-    
-    def _update_agriculture(self):
-        """Update agriculture system readings"""
-        # Crop health: target 85%, vary ±5%
-        self.current_state.agriculture.crop_health = max(75.0, min(95.0,
-            85.0 + random.gauss(0, 3.0)))
-        
-        # Nutrient levels: target 80%, vary ±8%
-        self.current_state.agriculture.nutrient_levels = max(70.0, min(90.0,
-            80.0 + random.gauss(0, 4.0)))
-        
-        # Harvest readiness: target 60%, vary ±10%
-        self.current_state.agriculture.harvest_readiness = max(40.0, min(80.0,
-            60.0 + random.gauss(0, 5.0)))
-    
-    def _update_structural(self):
-        """Update structural system readings"""
-        # Rotation rate: target 1.9 RPM, vary ±0.05 RPM
-        self.current_state.structural.rotation_rate = max(1.85, min(1.95,
-            1.9 + random.gauss(0, 0.02)))
-        
-        # Structural integrity: target 98%, vary ±1%
-        self.current_state.structural.structural_integrity = max(96.0, min(100.0,
-            98.0 + random.gauss(0, 0.5)))
-        
-        # Module pressure: target 14.7 psi, vary ±0.1 psi
-        self.current_state.structural.module_pressure = max(14.5, min(14.9,
-            14.7 + random.gauss(0, 0.05)))
+            self._tick_sensors()
+            # New readings: mark the telemetry dict stale immediately
+            self._state_fresh = False
+
+            # Publish this tick's JSON once and wake every streaming
+            # consumer; set-then-clear releases all current waiters while
+            # leaving the next wait() blocking until the next tick
+            self.telemetry_json = orjson.dumps(self.get_current_state())
+            self._tick_event.set()
+            self._tick_event.clear()
+
+            next_tick += 1.0
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))  # 1 Hz
+
+    async def wait_for_tick(self):
+        """Block until the next sensor tick publishes fresh telemetry"""
+        await self._tick_event.wait()
+
+    def _tick_sensors(self):
+        """Update every sensor from one batched Gaussian draw"""
+        # 19 plain fields plus the two solar draws: one C-level ziggurat
+        # call per tick, then mean + sigma * noise clipped to the sensor
+        # bands as a single vector op. tolist() yields plain floats so
+        # downstream code (round, orjson) never sees numpy scalars.
+        noise = self._noise
+        self._rng.standard_normal(out=noise)
+        _tick_noise_kernel(_SENSOR_MEAN, _SENSOR_SIGMA, _SENSOR_LO, _SENSOR_HI,
+                           noise[:19], self._vals)
+        vals = self._vals.tolist()
+
+        atmosphere = self.current_state.atmosphere
+        atmosphere.oxygen_level = vals[0]
+        atmosphere.co2_level = vals[1]
+        atmosphere.pressure = vals[2]
+        atmosphere.temperature = vals[3]
+        atmosphere.humidity = vals[4]
+
+        life_support = self.current_state.life_support
+        life_support.water_recovery_rate = vals[5]
+        life_support.waste_processing_efficiency = vals[6]
+        life_support.air_quality_index = vals[7]
+
+        # Solar generation: target 1 MW, vary ±50 kW (day/night cycle
+        # simulation) — a day/night factor times base power plus additive
+        # noise, so it keeps its own two draws
+        power = self.current_state.power
+        time_factor = 0.7 + 0.3 * abs(float(noise[19]) * 0.3)
+        power.solar_generation = max(0.0, min(1100.0,
+            1000.0 * time_factor + float(noise[20]) * 30.0))
+        power.battery_charge = vals[8]
+        power.power_consumption = vals[9]
+        power.energy_storage_level = vals[10]
+
+        radiation = self.current_state.radiation
+        radiation.radiation_level = vals[11]
+        radiation.shielding_effectiveness = vals[12]
+
+        agriculture = self.current_state.agriculture
+        agriculture.crop_health = vals[13]
+        agriculture.nutrient_levels = vals[14]
+        agriculture.harvest_readiness = vals[15]
+
+        structural = self.current_state.structural
+        structural.rotation_rate = vals[16]
+        structural.structural_integrity = vals[17]
+        structural.module_pressure = vals[18]
     
-    async def run(self):
-        """Start the sensor simulator"""
+    def run(self):
+        """Start the sensor simulator; returns the update task"""
+        # Synchronous: callers schedule the update loop directly instead
+        # of wrapping this in a transient task whose only job is to spawn
+        # the real one
         if not self.running:
             self.running = True
-            self._task = asyncio.create_task(self._update_sensors())
+            self._task = asyncio.get_running_loop().create_task(self._update_sensors())
+        return self._task
     
     def stop(self):
         """Stop the sensor simulator"""
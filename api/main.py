@@ -1,17 +1,19 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-import json
+from fastapi.responses import ORJSONResponse, StreamingResponse
 import asyncio
+import orjson
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 import uvicorn
 
 from app.sensor_simulator import SensorSimulator, get_sensor_simulator
 from app.models import SystemState, Alert, Recommendation, AuditLogEntry
 from app.routers import state, alerts, recommendations, audit_log, settlement_state, safety, decisions, anomaly, scenarios
 
-app = FastAPI(title="HELIOS Space Settlement API", version="1.0.0")
+# orjson serializes responses 3-5x faster than the stdlib json default
+app = FastAPI(title="HELIOS Space Settlement API", version="1.0.0",
+              default_response_class=ORJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -33,109 +35,124 @@ app.include_router(decisions.router, prefix="/api", tags=["decisions"])
 app.include_router(anomaly.router, prefix="/api", tags=["anomaly"])
 app.include_router(scenarios.router, prefix="/api", tags=["scenarios"])
 
-# Get singleton sensor simulator instance
-sensor_simulator = get_sensor_simulator()
+from app.safety_layer import SafetyLayer, get_safety_layer
 
-# Initialize safety layer
-from app.safety_layer import get_safety_layer
-safety_layer = get_safety_layer()
+# Singletons are created at startup rather than import: module import
+# stays light (tooling and tests import main.py repeatedly) and the
+# allocations overlap with uvicorn bring-up. Requests only arrive after
+# startup has run, so handlers always see initialized instances.
+sensor_simulator: Optional[SensorSimulator] = None
+safety_layer: Optional[SafetyLayer] = None
 
 @app.on_event("startup")
 async def startup_event():
     """Start sensor simulator on application startup"""
-    asyncio.create_task(sensor_simulator.run())
-    
-    # Start periodic safety checks
-    asyncio.create_task(periodic_safety_check())
-    
-    # Start periodic anomaly detection
-    asyncio.create_task(periodic_anomaly_detection())
+    global sensor_simulator, safety_layer
+    sensor_simulator = get_sensor_simulator()
+    safety_layer = get_safety_layer()
+
+    # Compile/prime the decision kernels up front so the first request
+    # doesn't pay numba's JIT latency
+    from app.decision_engine import warm_up
+    warm_up()
+
+    # run() schedules the update loop itself; no wrapper task needed
+    sensor_simulator.run()
 
-async def periodic_safety_check():
-    """Periodically check safety thresholds"""
-    from app.models import SettlementState, update_settlement_state_from_telemetry
+    # Drain queued alerts into the store in batches, off the request path
+    asyncio.create_task(alerts.drain_alert_queue())
     
+    # Start fused periodic safety/anomaly checks
+    asyncio.create_task(periodic_checks())
+
+async def periodic_checks():
+    """Run safety checks every 5 s and anomaly detection every 10 s
+
+    One fused task instead of two: both checks consume the same telemetry
+    and SettlementState, so sharing a loop builds them once per cycle and
+    halves the scheduler wakeups.
+    """
+    # Bound once at task start (routers are fully imported by then), not
+    # re-imported inside the loop
+    from app.sensor_simulator import get_settlement_snapshot
+    from app.anomaly_detector import get_anomaly_detector
+    from app.routers.alerts import queue_alerts
+    from app.routers.recommendations import record_recommendations
+
+    anomaly_detector = get_anomaly_detector()
+    tick = 0
+
     while True:
         try:
             await asyncio.sleep(5.0)  # Check every 5 seconds
+            tick += 1
             telemetry = sensor_simulator.get_current_state()
-            state = SettlementState()
-            state = update_settlement_state_from_telemetry(state, telemetry)
-            
+            state = await get_settlement_snapshot(sensor_simulator)
+
             # Check safety and get alerts/recommendations
             alerts, recommendations = safety_layer.check_safety(state, telemetry)
-            
-            # Add alerts to alerts database (import at runtime to avoid circular imports)
+
+            # Add alerts to alerts database
             if alerts:
-                import app.routers.alerts as alerts_module
-                alerts_module.alerts_db.extend(alerts)
-            
+                queue_alerts(alerts)
+
             # Add recommendations to recommendations database
             if recommendations:
-                import app.routers.recommendations as recommendations_module
-                recommendations_module.recommendations_db.extend(recommendations)
-        except Exception as e:
-            print(f"Safety check error: {e}")
+                record_recommendations(recommendations)
 
-async def periodic_anomaly_detection():
-    """Periodically run anomaly detection"""
-    from app.models import SettlementState, update_settlement_state_from_telemetry
-    from app.anomaly_detector import get_anomaly_detector
-    
-    anomaly_detector = get_anomaly_detector()
-    
-    while True:
-        try:
-            await asyncio.sleep(10.0)  # Check every 10 seconds
-            telemetry = sensor_simulator.get_current_state()
-            state = SettlementState()
-            state = update_settlement_state_from_telemetry(state, telemetry)
-            
-            # Detect anomalies
-            anomaly_alerts = anomaly_detector.detect_anomalies(
-                pressure=state.pressure_kpa,
-                radiation=state.radiation_msv_hr,
-                battery=state.battery_kwh
-            )
-            
-            # Add anomaly alerts to alerts database
-            if anomaly_alerts:
-                import app.routers.alerts as alerts_module
-                for anomaly_alert in anomaly_alerts:
-                    alert = Alert(
-                        id=anomaly_alert.id,
-                        timestamp=anomaly_alert.timestamp,
-                        severity=anomaly_alert.severity,
-                        category=f"anomaly_{anomaly_alert.metric}",
-                        message=anomaly_alert.message,
-                        system=anomaly_alert.metric
-                    )
-                    alerts_module.alerts_db.append(alert)
+            # Anomaly detection runs every other cycle (10 s cadence)
+            if tick % 2 == 0:
+                anomaly_alerts = anomaly_detector.detect_anomalies(
+                    pressure=state.pressure_kpa,
+                    radiation=state.radiation_msv_hr,
+                    battery=state.battery_kwh
+                )
+
+                # Add anomaly alerts to alerts database
+                if anomaly_alerts:
+                    queue_alerts([
+                        Alert(
+                            id=anomaly_alert.id,
+                            timestamp=anomaly_alert.timestamp,
+                            severity=anomaly_alert.severity,
+                            category=f"anomaly_{anomaly_alert.metric}",
+                            message=anomaly_alert.message,
+                            system=anomaly_alert.metric
+                        )
+                        for anomaly_alert in anomaly_alerts
+                    ])
         except Exception as e:
-            print(f"Anomaly detection error: {e}")
+            print(f"Periodic check error: {e}")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Stop sensor simulator on application shutdown"""
-    sensor_simulator.stop()
+    # Shutdown can fire without startup completing (startup exception,
+    # partial lifespan in tooling); nothing to stop in that case
+    if sensor_simulator is not None:
+        sensor_simulator.stop()
+
+# The root payload is constant, so it is encoded to bytes once at import
+# (same pattern as the scenarios and thresholds listings)
+_ROOT_JSON = orjson.dumps({
+    "message": "HELIOS Space Settlement API",
+    "version": "1.0.0",
+    "endpoints": {
+        "telemetry": "/telemetry",
+        "state": "/api/state",
+        "alerts": "/api/alerts",
+        "recommendations": "/api/recommendations",
+        "audit-log": "/api/audit-log",
+        "safety": "/api/safety",
+        "decisions": "/api/decisions",
+        "anomaly": "/api/anomaly",
+        "scenarios": "/api/scenarios"
+    }
+})
 
 @app.get("/")
 async def root():
-    return {
-        "message": "HELIOS Space Settlement API",
-        "version": "1.0.0",
-        "endpoints": {
-            "telemetry": "/telemetry",
-            "state": "/api/state",
-            "alerts": "/api/alerts",
-            "recommendations": "/api/recommendations",
-            "audit-log": "/api/audit-log",
-            "safety": "/api/safety",
-            "decisions": "/api/decisions",
-            "anomaly": "/api/anomaly",
-            "scenarios": "/api/scenarios"
-        }
-    }
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 @app.get("/telemetry")
 async def get_telemetry():
@@ -145,12 +162,16 @@ async def get_telemetry():
 @app.websocket("/ws/telemetry")
 async def websocket_telemetry(websocket: WebSocket):
     """WebSocket endpoint for real-time telemetry streaming at 1 Hz"""
+    # The simulator serializes each tick exactly once; every client just
+    # sends the shared bytes and sleeps on the tick event in between, so
+    # clients stay in phase with the sensors instead of drifting on their
+    # own 1 s timers
     await websocket.accept()
     try:
         while True:
-            telemetry = sensor_simulator.get_current_state()
-            await websocket.send_json(telemetry)
-            await asyncio.sleep(1.0)  # 1 Hz = 1 second interval
+            if sensor_simulator.telemetry_json:
+                await websocket.send_bytes(sensor_simulator.telemetry_json)
+            await sensor_simulator.wait_for_tick()
     except WebSocketDisconnect:
         pass
 
@@ -159,11 +180,18 @@ async def stream_telemetry():
     """Server-Sent Events (SSE) endpoint for telemetry streaming at 1 Hz"""
     async def generate():
         while True:
-            telemetry = sensor_simulator.get_current_state()
-            yield f"data: {json.dumps(telemetry)}\n\n"
-            await asyncio.sleep(1.0)  # 1 Hz
-    
+            if sensor_simulator.telemetry_json:
+                yield b"data: " + sensor_simulator.telemetry_json + b"\n\n"
+            await sensor_simulator.wait_for_tick()
+
     return StreamingResponse(generate(), media_type="text/event-stream")
 
 if __name__ == "__main__":
+    # uvloop's C event loop speeds up task switching and socket I/O
+    # across the board; optional, like numba for the numeric kernels
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     uvicorn.run(app, host="0.0.0.0", port=8000)